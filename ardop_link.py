@@ -2,7 +2,7 @@
 ARDOP link-layer wrapper over a TCP stream.
 
 Provides:
-- Background RX/TX threads
+- A background I/O thread multiplexing RX and TX on one selector
 - Reconnect with backoff
 - Simple `send(payload_bytes)` API
 - A receive callback that yields *raw mesh payload bytes*.
@@ -20,23 +20,82 @@ body) with no AX.25 or KISS framing.
 
 from __future__ import annotations
 
-from dataclasses import dataclass, asdict
+from dataclasses import dataclass, fields
 
+import collections
+import functools
 import logging
-import queue
+import selectors
 import socket
+import struct
 import threading
 import time
-from typing import Callable, Optional
+from typing import Callable, List, Optional
 
 from mesh_config import ArdopConnectionConfig
 
 
 LOG = logging.getLogger(__name__)
 
+# uint16_be frame length prefix
+_FRAME_LEN = struct.Struct(">H")
+
+
+@functools.lru_cache(maxsize=256)
+def _frame_header(frame_len: int) -> bytes:
+    """Length prefix for a TX frame; chat traffic reuses a handful of sizes."""
+    return _FRAME_LEN.pack(frame_len)
+
+
+# Kernel socket buffer size requested for the TNC data connection. Bursts of
+# small frames then fit in one recv()/send() instead of many partial ones.
+_SOCK_BUF_BYTES = 262144
+
+# How long a write may sit on a full (non-blocking) socket waiting to drain
+# before treating the connection as broken.
+_TX_WRITABLE_TIMEOUT = 5.0
+
+# Bounds on how many queued frames one TX wakeup coalesces into a single
+# gathered write (keeps latency bounded and stays well under IOV_MAX).
+_TX_BATCH_FRAMES = 64
+_TX_BATCH_BYTES = 65536
+
+# Linux-only: hold partial segments while a multi-frame batch is written,
+# then flush on uncork. TCP_NODELAY stays on for single frames.
+_HAVE_TCP_CORK = hasattr(socket, "TCP_CORK")
+
+# Gathered writes (writev) are POSIX-only; Windows sends buffers one by one.
+_HAVE_SENDMSG = hasattr(socket.socket, "sendmsg")
+# Without sendmsg, MSG_MORE (Linux) still lets sequential sends of header
+# and payload leave in one segment.
+_MSG_MORE = getattr(socket, "MSG_MORE", 0)
+
+# Size of the preallocated buffer each recv_into() fills. Sized like a
+# typical receive window so one syscall can pull in many queued frames.
+_RX_CHUNK_BYTES = 65536
+
+# Upper bound on frames delivered to rx_callback per _process_rx_bytes()
+# call, so a large backlog cannot starve recv() or delay shutdown checks.
+_MAX_FRAMES_PER_RECV = 32
+
+# Consumed RX bytes are only discarded (memmove) once the read cursor has
+# passed this many bytes *and* more than half of the buffer.
+_RX_COMPACT_BYTES = 4096
+
+# A corrupt length prefix can leave the framer waiting forever for bytes
+# that never come. If a partial frame sees no new bytes for this long, the
+# buffer is discarded and the connection dropped to resync the stream. The
+# timeout counts from the last byte received, not the last frame, so a
+# large frame trickling in over a slow HF link is not cut off. No byte
+# bound is needed: the u16 prefix caps a frame at 0xFFFF bytes, and reads
+# pause while a frame backlog is buffered.
+_RX_STALL_TIMEOUT = 30.0
+
 
 @dataclass
 class LinkMetrics:
+    # All *_ts fields are stored as time.monotonic() readings; get_metrics()
+    # converts them to wall-clock seconds for consumers.
     name: str
     link_type: str
     running: bool
@@ -62,7 +121,20 @@ class LinkMetrics:
     last_error: str = ""
 
     def to_dict(self) -> dict:
-        return asdict(self)
+        # Flat scalar fields only: skip asdict()'s recursive deep copy.
+        return {name: getattr(self, name) for name in _METRIC_FIELDS}
+
+
+_METRIC_FIELDS = tuple(f.name for f in fields(LinkMetrics))
+
+
+_METRIC_TS_FIELDS = (
+    "started_ts",
+    "last_connect_ts",
+    "last_disconnect_ts",
+    "last_rx_ts",
+    "last_tx_ts",
+)
 
 
 class ArdopLinkError(Exception):
@@ -96,21 +168,49 @@ class ArdopLinkClient:
 
         self._sock: Optional[socket.socket] = None
         self._running = threading.Event()
+        # Plain mirror of _running for the hot loops: a bool read does not
+        # take the Event's internal lock. Always updated alongside it.
+        self._running_flag = False
         self._connected = threading.Event()
 
-        self._rx_thread: Optional[threading.Thread] = None
-        self._tx_thread: Optional[threading.Thread] = None
-
-        # TX queue holds *payload* frames (no length prefix)
-        self._tx_queue: "queue.Queue[bytes]" = queue.Queue(
-            maxsize=self._config.tx_queue_size
-        )
-
-        # Buffer for assembling frames from the TCP stream
+        # One thread multiplexes RX and TX for the connection.
+        self._io_thread: Optional[threading.Thread] = None
+        self._io_ident: Optional[int] = None
+
+        # TX queue holds *payload* frames (no length prefix). Senders append
+        # and the I/O thread pops; deque append/popleft are atomic, so the
+        # event below is only used for wakeups, not for mutual exclusion.
+        self._tx_deque: "collections.deque[bytes]" = collections.deque()
+        self._tx_maxsize = int(self._config.tx_queue_size)
+        self._tx_space = threading.Event()  # I/O thread popped a frame
+
+        # Batch currently being written (headers + payloads), owned by the
+        # I/O thread. Survives partial writes until the socket drains.
+        self._tx_views: List[memoryview] = []
+        self._tx_batch_frames = 0
+        self._tx_batch_bytes = 0
+        self._tx_corked = False
+        # Monotonic deadline for a stalled (would-block) write; 0.0 if none.
+        self._tx_deadline = 0.0
+
+        # Buffer for assembling frames from the TCP stream; bytes before
+        # _rx_head have already been delivered.
         self._rx_buffer = bytearray()
+        self._rx_head = 0
+        # Reused recv_into() target, so reads don't allocate a bytes object.
+        self._rx_scratch = memoryview(bytearray(_RX_CHUNK_BYTES))
+        # True when _process_rx_bytes stopped at the frame cap with
+        # complete frames still buffered.
+        self._rx_backlog = False
+        # Last time RX bytes arrived or the framer delivered/emptied the buffer.
+        self._rx_progress_ts = 0.0
 
         self._lock = threading.Lock()
 
+        # Self-wakeup pair: lets send()/stop() interrupt the selector wait.
+        self._wakeup_r: Optional[socket.socket] = None
+        self._wakeup_w: Optional[socket.socket] = None
+
         self._metrics = LinkMetrics(
             name=str(self._name),
             link_type="ardop",
@@ -123,59 +223,65 @@ class ArdopLinkClient:
     # ------------------------------------------------------------------
 
     def start(self) -> None:
-        """Start RX/TX threads and establish a TCP connection."""
+        """Start the I/O thread and establish a TCP connection."""
         if self._running.is_set():
             LOG.warning("ArdopLinkClient %s already running", self._name)
             return
 
+        self._wakeup_r, self._wakeup_w = socket.socketpair()
+        self._wakeup_r.setblocking(False)
+        self._wakeup_w.setblocking(False)
+
+        self._running_flag = True
         self._running.set()
         self._metrics.running = True
-        self._metrics.started_ts = time.time()
+        self._metrics.started_ts = time.monotonic()
 
-        self._rx_thread = threading.Thread(
-            target=self._rx_loop,
-            name=f"{self._name}-rx",
+        self._io_thread = threading.Thread(
+            target=self._io_loop,
+            name=f"{self._name}-io",
             daemon=True,
         )
-        self._tx_thread = threading.Thread(
-            target=self._tx_loop,
-            name=f"{self._name}-tx",
-            daemon=True,
-        )
-
-        self._rx_thread.start()
-        self._tx_thread.start()
+        self._io_thread.start()
 
     def stop(self, timeout: float = 5.0) -> None:
-        """Stop RX/TX threads and close the TCP connection."""
+        """Stop the I/O thread and close the TCP connection."""
         if not self._running.is_set():
             return
 
+        self._running_flag = False
         self._running.clear()
         self._metrics.running = False
 
-        # Wake TX thread so it can exit
-        try:
-            self._tx_queue.put_nowait(b"")
-        except queue.Full:
-            LOG.warning("TX queue full while stopping; forcing shutdown")
+        # Wake any sender blocked on a full queue, and the I/O thread
+        self._tx_space.set()
+        self._wake_io()
 
-        if self._rx_thread is not None:
-            self._rx_thread.join(timeout=timeout)
-        if self._tx_thread is not None:
-            self._tx_thread.join(timeout=timeout)
+        if self._io_thread is not None:
+            self._io_thread.join(timeout=timeout)
 
+        # Only the handle swap happens under the lock; close() does not.
         with self._lock:
-            if self._sock is not None:
+            old_sock = self._sock
+            self._sock = None
+            self._connected.clear()
+        if old_sock is not None:
+            self._metrics.connected = False
+            self._metrics.last_disconnect_ts = time.monotonic()
+            self._metrics.disconnects += 1
+            try:
+                old_sock.close()
+            except OSError:
+                LOG.warning("Error closing ARDOP socket", exc_info=True)
+
+        for wakeup in (self._wakeup_r, self._wakeup_w):
+            if wakeup is not None:
                 try:
-                    self._sock.close()
+                    wakeup.close()
                 except OSError:
-                    LOG.warning("Error closing ARDOP socket", exc_info=True)
-                self._sock = None
-                self._connected.clear()
-                self._metrics.connected = False
-                self._metrics.last_disconnect_ts = time.time()
-                self._metrics.disconnects += 1
+                    pass
+        self._wakeup_r = None
+        self._wakeup_w = None
 
     def send(
         self,
@@ -185,27 +291,65 @@ class ArdopLinkClient:
     ) -> None:
         """Queue a single *mesh frame payload* for transmission.
 
-        The payload is any bytes blob (mesh header + body). The client
-        will length-prefix it on the TCP stream.
+        The payload is any bytes-like blob (mesh header + body); bytes are
+        queued without copying, bytearray/memoryview are snapshotted. The
+        client will length-prefix it on the TCP stream.
+
+        Frames sent while the TCP connection is down are dropped (and
+        counted in tx_dropped_no_conn) rather than queued.
 
         Raises ArdopLinkError if the client is not running or the queue is full.
         """
-        if not self._running.is_set():
+        if not self._running_flag:
             raise ArdopLinkError("Cannot send: client is not running")
 
-        if not isinstance(payload, (bytes, bytearray)):
+        if not isinstance(payload, (bytes, bytearray, memoryview)):
             raise TypeError("payload must be bytes-like")
 
-        try:
-            # NOTE: we treat b"" in the queue as a shutdown sentinel.
-            # Empty frames are unusual; if you really need them, this
-            # logic could be adjusted to use a different sentinel.
-            if payload == b"":
-                LOG.debug("Ignoring empty payload send() request")
+        # NOTE: empty frames are unusual and are not transmitted.
+        if not payload:
+            LOG.debug("Ignoring empty payload send() request")
+            return
+
+        if not self._connected.is_set():
+            self._metrics.tx_dropped_no_conn += 1
+            LOG.warning("Dropping TX frame: no ARDOP TCP connection available")
+            return
+
+        if type(payload) is not bytes:
+            # Snapshot mutable buffers; immutable bytes are queued as-is.
+            payload = bytes(payload)
+
+        # The I/O thread itself (rx_callback forwarding a frame) must never
+        # wait on the queue it drains, so it may overfill it instead.
+        on_io_thread = threading.get_ident() == self._io_ident
+        maxsize = self._tx_maxsize
+        if maxsize > 0 and len(self._tx_deque) >= maxsize and not on_io_thread:
+            self._wait_for_tx_space(block, timeout)
+
+        was_empty = not self._tx_deque
+        self._tx_deque.append(payload)
+        # A non-empty queue is always looked at before the selector blocks,
+        # so only the empty -> non-empty transition needs a wakeup.
+        if was_empty and not on_io_thread:
+            self._wake_io()
+
+    def _wait_for_tx_space(self, block: bool, timeout: Optional[float]) -> None:
+        """Block (per send() semantics) until the TX queue has room."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while len(self._tx_deque) >= self._tx_maxsize:
+            if not block:
+                raise ArdopLinkError("TX queue is full")
+            # Clear, then re-check: a pop between the two is not missed.
+            self._tx_space.clear()
+            if len(self._tx_deque) < self._tx_maxsize:
                 return
-            self._tx_queue.put(bytes(payload), block=block, timeout=timeout)
-        except queue.Full as put_error:
-            raise ArdopLinkError("TX queue is full") from put_error
+            remaining = None if deadline is None else deadline - time.monotonic()
+            if remaining is not None and remaining <= 0.0:
+                raise ArdopLinkError("TX queue is full")
+            self._tx_space.wait(remaining)
+            if not self._running_flag:
+                raise ArdopLinkError("Cannot send: client is not running")
 
     def is_connected(self) -> bool:
         return self._connected.is_set()
@@ -215,17 +359,27 @@ class ArdopLinkClient:
         with self._lock:
             self._metrics.connected = self._connected.is_set()
             self._metrics.running = self._running.is_set()
-            return dict(self._metrics.to_dict())
+            snapshot = self._metrics.to_dict()
+
+        # Timestamps are recorded with the monotonic clock; expose wall-clock.
+        wall_offset = time.time() - time.monotonic()
+        for key in _METRIC_TS_FIELDS:
+            if snapshot[key] > 0.0:
+                snapshot[key] += wall_offset
+        return snapshot
 
     # ------------------------------------------------------------------
     # Connection management
     # ------------------------------------------------------------------
 
-    def _connect_with_backoff(self) -> None:
-        """Ensure there is a working TCP connection, with backoff on failure."""
+    def _connect_with_backoff(self) -> Optional[socket.socket]:
+        """Ensure there is a working TCP connection, with backoff on failure.
+
+        Returns the connected socket, or None if the client stopped first.
+        """
         delay = self._config.reconnect_base_delay
 
-        while self._running.is_set() and not self._connected.is_set():
+        while self._running_flag and not self._connected.is_set():
             try:
                 self._metrics.connect_attempts += 1
                 LOG.info(
@@ -238,27 +392,37 @@ class ArdopLinkClient:
                     timeout=10.0,
                 )
                 sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
-                sock.settimeout(5.0)
+                self._tune_socket(sock)
+                sock.setblocking(False)
 
+                # RX state belongs to this (the I/O) thread; reset it unlocked.
+                self._rx_buffer.clear()
+                self._rx_head = 0
+                self._rx_backlog = False
+                self._rx_progress_ts = time.monotonic()
+
+                # Only the handle swap happens under the lock.
                 with self._lock:
-                    if self._sock is not None:
-                        try:
-                            self._sock.close()
-                        except OSError:
-                            LOG.warning(
-                                "Error closing previous ARDOP socket",
-                                exc_info=True,
-                            )
+                    old_sock = self._sock
                     self._sock = sock
-                    self._rx_buffer.clear()
                     self._connected.set()
-                    self._metrics.connected = True
-                    self._metrics.last_connect_ts = time.time()
-                    self._metrics.connect_successes += 1
-                    self._metrics.last_error = ""
+
+                self._metrics.connected = True
+                self._metrics.last_connect_ts = time.monotonic()
+                self._metrics.connect_successes += 1
+                self._metrics.last_error = ""
+
+                if old_sock is not None:
+                    try:
+                        old_sock.close()
+                    except OSError:
+                        LOG.warning(
+                            "Error closing previous ARDOP socket",
+                            exc_info=True,
+                        )
 
                 LOG.info("ARDOP TCP connection established")
-                return
+                return sock
 
             except OSError:
                 self._connected.clear()
@@ -272,163 +436,348 @@ class ArdopLinkClient:
                 if delay < self._config.reconnect_max_delay:
                     delay *= 2.0
 
-    # ------------------------------------------------------------------
-    # RX / TX loops
-    # ------------------------------------------------------------------
-
-    def _rx_loop(self) -> None:
-        """Receive loop: assemble framed payloads from the TCP stream."""
-        while self._running.is_set():
-            if (not self._connected.is_set()) or (self._sock is None):
-                self._connect_with_backoff()
-                if (not self._connected.is_set()) or (self._sock is None):
-                    # Give up for a moment and retry
-                    time.sleep(1.0)
-                    continue
+        return self._sock if self._connected.is_set() else None
 
+    @staticmethod
+    def _tune_socket(sock: socket.socket) -> None:
+        """Best-effort latency/throughput socket options (platform dependent)."""
+        if hasattr(socket, "TCP_QUICKACK"):
             try:
-                with self._lock:
-                    sock = self._sock
-                if sock is None:
-                    self._connected.clear()
-                    continue
-
-                data = sock.recv(4096)
-                if not data:
-                    # Remote closed connection
-                    LOG.warning("ARDOP TCP connection closed by peer; reconnecting")
-                    with self._lock:
-                        try:
-                            sock.close()
-                        except OSError:
-                            pass
-                        self._sock = None
-                        self._connected.clear()
-                        self._metrics.connected = False
-                        self._metrics.last_disconnect_ts = time.time()
-                        self._metrics.disconnects += 1
-                    time.sleep(1.0)
-                    continue
+                sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_QUICKACK, 1)
+            except OSError:
+                LOG.debug("TCP_QUICKACK not supported on ARDOP socket")
+        for opt in (socket.SO_RCVBUF, socket.SO_SNDBUF):
+            try:
+                sock.setsockopt(socket.SOL_SOCKET, opt, _SOCK_BUF_BYTES)
+            except OSError:
+                LOG.debug("Could not resize ARDOP socket buffer (opt=%d)", opt)
 
-                self._process_rx_bytes(data)
+    def _drop_socket(self, sock: socket.socket) -> None:
+        """Tear down a failed connection from the I/O loop error paths.
 
-            except socket.timeout:
-                # Normal; just loop again
-                continue
-            except OSError:
-                LOG.warning("RX loop lost ARDOP connection; reconnecting", exc_info=True)
-                with self._lock:
-                    if self._sock is not None:
-                        try:
-                            self._sock.close()
-                        except OSError:
-                            pass
-                        self._sock = None
-                        self._connected.clear()
-                        self._metrics.connected = False
-                        self._metrics.last_disconnect_ts = time.time()
-                        self._metrics.disconnects += 1
-                time.sleep(1.0)
-
-    def _tx_loop(self) -> None:
-        """Transmit loop: length-prefix and send frames from the queue."""
-        while self._running.is_set():
+        The shared handle is cleared with a try-lock: if another thread
+        holds _lock it is already swapping or tearing down the socket, so we
+        only mark the link disconnected and let that thread finish.
+        """
+        self._connected.clear()
+        if self._lock.acquire(blocking=False):
             try:
-                payload = self._tx_queue.get(timeout=1.0)
-            except queue.Empty:
-                continue
+                if self._sock is sock:
+                    self._sock = None
+                    self._metrics.connected = False
+                    self._metrics.last_disconnect_ts = time.monotonic()
+                    self._metrics.disconnects += 1
+            finally:
+                self._lock.release()
+        try:
+            sock.close()
+        except OSError:
+            pass
+
+    def _wake_io(self) -> None:
+        """Interrupt the I/O selector wait (queued TX, shutdown)."""
+        wakeup = self._wakeup_w
+        if wakeup is None:
+            return
+        try:
+            wakeup.send(b"x")
+        except OSError:
+            # Pair already closed, or wakeup buffer full (a wake is pending).
+            pass
 
-            if not self._running.is_set():
-                break
-            if payload == b"":
-                # Sentinel used during shutdown
-                continue
+    @staticmethod
+    def _set_cork(sock: socket.socket, enabled: bool) -> None:
+        try:
+            sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_CORK, 1 if enabled else 0)
+        except OSError:
+            LOG.debug("Could not toggle TCP_CORK on ARDOP socket", exc_info=True)
 
-            if (not self._connected.is_set()) or (self._sock is None):
-                if (not self._connected.is_set()) or (self._sock is None):
-                    self._metrics.tx_dropped_no_conn += 1
-                    LOG.warning("Dropping TX frame: no ARDOP TCP connection available")
-                    continue
+    # ------------------------------------------------------------------
+    # TX batching
+    # ------------------------------------------------------------------
 
-            # Build [len_hi][len_lo] + payload
-            if len(payload) > 0xFFFF:
+    def _fill_tx_batch(self, sock: socket.socket) -> None:
+        """Pop up to one batch of queued frames into the in-flight write."""
+        # Each frame is [len_hi][len_lo] + payload
+        views = self._tx_views
+        frames = 0
+        frame_bytes = 0
+        popped = False
+        while frames < _TX_BATCH_FRAMES and frame_bytes < _TX_BATCH_BYTES:
+            try:
+                payload = self._tx_deque.popleft()
+            except IndexError:
+                break
+            popped = True
+            frame_len = len(payload)
+            if frame_len > 0xFFFF:
                 LOG.warning("Payload too large for 16-bit length; dropping frame")
                 continue
+            views.append(memoryview(_frame_header(frame_len)))
+            views.append(memoryview(payload))
+            frames += 1
+            frame_bytes += frame_len
+        if popped:
+            self._tx_space.set()
+
+        self._tx_batch_frames = frames
+        self._tx_batch_bytes = frame_bytes
+        if _HAVE_TCP_CORK and frames > 1:
+            self._set_cork(sock, True)
+            self._tx_corked = True
+
+    def _flush_tx(self, sock: socket.socket) -> bool:
+        """Write as much of the in-flight batch as the socket accepts.
+
+        Uses a single gathered sendmsg() where available so header and
+        payload are never concatenated in userspace; otherwise buffers are
+        sent in turn, flagged MSG_MORE (where supported) until the last one.
+        Partial writes advance through memoryviews instead of re-slicing.
+
+        Returns True once the batch is fully written, False if the socket
+        would block. Raises ArdopLinkError if it stays full too long.
+        """
+        views = self._tx_views
+        while views:
+            try:
+                if _HAVE_SENDMSG:
+                    sent = sock.sendmsg(views)
+                elif _MSG_MORE and len(views) > 1:
+                    sent = sock.send(views[0], _MSG_MORE)
+                else:
+                    sent = sock.send(views[0])
+            except BlockingIOError:
+                now = time.monotonic()
+                if not self._tx_deadline:
+                    self._tx_deadline = now + _TX_WRITABLE_TIMEOUT
+                elif now >= self._tx_deadline:
+                    raise ArdopLinkError("Timed out waiting for ARDOP socket to drain")
+                return False
+            if sent == 0:
+                raise ArdopLinkError("Socket connection broken during send")
+            self._tx_deadline = 0.0
+
+            # Skip fully written buffers; trim a partially written one.
+            idx = 0
+            while idx < len(views) and sent >= len(views[idx]):
+                sent -= len(views[idx])
+                idx += 1
+            del views[:idx]
+            if sent:
+                views[0] = views[0][sent:]
+
+        if self._tx_corked:
+            self._set_cork(sock, False)
+            self._tx_corked = False
+
+        # Successful send
+        self._metrics.tx_frames += self._tx_batch_frames
+        self._metrics.tx_bytes += self._tx_batch_bytes
+        self._metrics.last_tx_ts = time.monotonic()
+        self._tx_batch_frames = 0
+        self._tx_batch_bytes = 0
+        return True
+
+    def _discard_tx(self) -> None:
+        """Drop the in-flight batch and queued frames after losing the connection."""
+        dropped = self._tx_batch_frames
+        while True:
+            try:
+                self._tx_deque.popleft()
+            except IndexError:
+                break
+            dropped += 1
+        self._tx_views.clear()
+        self._tx_batch_frames = 0
+        self._tx_batch_bytes = 0
+        self._tx_corked = False
+        self._tx_deadline = 0.0
+        self._tx_space.set()
+        if dropped:
+            self._metrics.tx_dropped_no_conn += dropped
+            LOG.warning(
+                "Dropping %d TX frame(s): no ARDOP TCP connection available",
+                dropped,
+            )
 
-            frame_len = len(payload)
-            header = bytes([(frame_len >> 8) & 0xFF, frame_len & 0xFF])
-            to_send = header + payload
+    # ------------------------------------------------------------------
+    # I/O loop
+    # ------------------------------------------------------------------
 
-            try:
-                with self._lock:
-                    sock = self._sock
-                if sock is None:
-                    raise ArdopLinkError("ARDOP socket missing in TX loop")
-
-                total_sent = 0
-                while total_sent < len(to_send):
-                    sent = sock.send(to_send[total_sent:])
-                    if sent == 0:
-                        raise ArdopLinkError("Socket connection broken during send")
-                    total_sent += sent
-
-                # Successful send
-                self._metrics.tx_frames += 1
-                self._metrics.tx_bytes += int(frame_len)
-                self._metrics.last_tx_ts = time.time()
-
-            except (OSError, ArdopLinkError):
-                self._metrics.tx_errors += 1
-                self._metrics.last_error = "tx_error"
-                LOG.warning(
-                    "Error writing ARDOP frame; dropping connection and retrying",
-                    exc_info=True,
-                )
-                with self._lock:
-                    if self._sock is not None:
+    def _io_loop(self) -> None:
+        """Single selector loop: write queued frames and assemble RX frames."""
+        self._io_ident = threading.get_ident()
+        sel = selectors.DefaultSelector()
+        wakeup = self._wakeup_r
+        if wakeup is not None:
+            sel.register(wakeup, selectors.EVENT_READ)
+        registered: Optional[socket.socket] = None
+        registered_mask = 0
+        # The I/O thread owns the connection; it keeps its own reference
+        # rather than re-reading self._sock under the lock every pass.
+        sock: Optional[socket.socket] = None
+
+        try:
+            while self._running_flag:
+                if sock is None or not self._connected.is_set():
+                    self._discard_tx()
+                    sock = self._connect_with_backoff()
+                    if sock is None:
+                        # Give up for a moment and retry
+                        time.sleep(1.0)
+                        continue
+
+                if sock is not registered:
+                    if registered is not None:
                         try:
-                            self._sock.close()
-                        except OSError:
+                            sel.unregister(registered)
+                        except (KeyError, ValueError):
                             pass
-                        self._sock = None
-                        self._connected.clear()
-                time.sleep(1.0)
+                    sel.register(sock, selectors.EVENT_READ)
+                    registered = sock
+                    registered_mask = selectors.EVENT_READ
+
+                # Write first so queued frames go out before we block.
+                write_blocked = False
+                if not self._tx_views and self._tx_deque:
+                    self._fill_tx_batch(sock)
+                if self._tx_views:
+                    try:
+                        write_blocked = not self._flush_tx(sock)
+                    except (OSError, ArdopLinkError):
+                        self._metrics.tx_errors += 1
+                        self._metrics.last_error = "tx_error"
+                        LOG.warning(
+                            "Error writing ARDOP frame; dropping connection and retrying",
+                            exc_info=True,
+                        )
+                        self._drop_socket(sock)
+                        sock = None
+                        time.sleep(1.0)
+                        continue
+
+                mask = selectors.EVENT_READ
+                if write_blocked:
+                    mask |= selectors.EVENT_WRITE
+                if mask != registered_mask:
+                    sel.modify(sock, mask)
+                    registered_mask = mask
+
+                # Don't block while buffered frames or queued TX are waiting.
+                if self._rx_backlog or (self._tx_deque and not write_blocked):
+                    wait: Optional[float] = 0.0
+                elif write_blocked:
+                    wait = max(0.0, self._tx_deadline - time.monotonic())
+                else:
+                    wait = None
+
+                # A partial frame must wake us when its stall window closes,
+                # even if no further bytes ever arrive.
+                if self._rx_buffer and not self._rx_backlog:
+                    stall_wait = max(0.0, self._rx_progress_ts + _RX_STALL_TIMEOUT - time.monotonic())
+                    if wait is None or stall_wait < wait:
+                        wait = stall_wait
+
+                # While complete frames are still buffered, drain them before
+                # reading more; otherwise input outpaces the per-pass frame cap
+                # and the buffer grows without bound.
+                backlog = self._rx_backlog
+                try:
+                    for key, events in sel.select(timeout=wait):
+                        if key.fileobj is wakeup:
+                            try:
+                                wakeup.recv(64)
+                            except BlockingIOError:
+                                pass
+                            continue
+                        if not events & selectors.EVENT_READ:
+                            # Writable: the flush at the top of the loop resumes.
+                            continue
+                        if backlog:
+                            continue
+
+                        nbytes = sock.recv_into(self._rx_scratch)
+                        if not nbytes:
+                            # Remote closed connection
+                            LOG.warning("ARDOP TCP connection closed by peer; reconnecting")
+                            self._drop_socket(sock)
+                            sock = None
+                            time.sleep(1.0)
+                            break
+
+                        self._process_rx_bytes(self._rx_scratch[:nbytes])
+
+                    if backlog:
+                        self._process_rx_bytes(b"")
+                    elif sock is not None:
+                        self._check_rx_stall()
+
+                except BlockingIOError:
+                    # Spurious readiness; just loop again
+                    continue
+                except OSError:
+                    LOG.warning("I/O loop lost ARDOP connection; reconnecting", exc_info=True)
+                    if sock is not None:
+                        self._drop_socket(sock)
+                    sock = None
+                    time.sleep(1.0)
+        finally:
+            sel.close()
+            self._discard_tx()
 
     # ------------------------------------------------------------------
     # RX framing
     # ------------------------------------------------------------------
 
     # noinspection PyBroadException
-    def _process_rx_bytes(self, data: bytes) -> None:
+    def _process_rx_bytes(self, data: bytes | memoryview) -> None:
         """Append incoming bytes to buffer and extract complete frames."""
         self._rx_buffer.extend(data)
 
-        # Try to peel off as many frames as possible
+        # RX metrics are accumulated locally and stamped once per call.
+        frames_added = 0
+        bytes_added = 0
+
+        self._rx_backlog = False
+
+        # Hot loop state lives in locals: the buffer length is fixed while
+        # frames are peeled, and global/attribute lookups are hoisted.
+        buf = self._rx_buffer
+        buf_len = len(buf)
+        view = memoryview(buf)
+        head = self._rx_head
+        unpack_len = _FRAME_LEN.unpack_from
+        rx_callback = self._rx_callback
+        max_frames = _MAX_FRAMES_PER_RECV
+
+        # Peel off complete frames, up to the per-call cap
         while True:
-            if len(self._rx_buffer) < 2:
+            if frames_added >= max_frames:
+                # Yield back to the I/O loop; the rest stays buffered.
+                self._rx_backlog = True
+                break
+
+            if buf_len - head < 2:
                 # Need more bytes for length prefix
-                return
+                break
 
-            frame_len = (self._rx_buffer[0] << 8) | self._rx_buffer[1]
-            if len(self._rx_buffer) < 2 + frame_len:
+            frame_len = unpack_len(buf, head)[0]
+            if buf_len - head < 2 + frame_len:
                 # Incomplete frame; wait for more data
-                return
-
-            # Extract frame
-            start = 2
-            end = 2 + frame_len
-            frame = bytes(self._rx_buffer[start:end])
+                break
 
-            self._metrics.rx_frames += 1
-            self._metrics.rx_bytes += int(frame_len)
-            self._metrics.last_rx_ts = time.time()
+            # Extract frame (single copy out of the buffer) and advance cursor
+            start = head + 2
+            end = start + frame_len
+            frame = bytes(view[start:end])
+            head = end
 
-            # Remove from buffer
-            del self._rx_buffer[:end]
+            frames_added += 1
+            bytes_added += frame_len
 
             # Deliver to user callback
             try:
-                self._rx_callback(frame)
+                rx_callback(frame)
             except (ValueError, RuntimeError, ArdopLinkError):
                 # Expected "bad frame" / "cannot decode" style failures from consumers.
                 # We drop the frame and continue.
@@ -445,13 +794,55 @@ class ArdopLinkClient:
                 LOG.exception(
                     "Unhandled exception in ARDOP RX callback; stopping link client",
                 )
+                self._running_flag = False
                 self._running.clear()
-                self._connected.clear()
-                with self._lock:
-                    if self._sock is not None:
-                        try:
-                            self._sock.close()
-                        except OSError:
-                            pass
-                        self._sock = None
-                return
+                sock = self._sock
+                if sock is not None:
+                    self._drop_socket(sock)
+                else:
+                    self._connected.clear()
+                break
+
+        # The buffer cannot be resized while a view is exported.
+        view.release()
+        if head >= buf_len:
+            buf.clear()
+            head = 0
+        elif head > _RX_COMPACT_BYTES and head * 2 > buf_len:
+            del buf[:head]
+            head = 0
+        self._rx_head = head
+
+        now = time.monotonic()
+        pending = len(buf) - head
+        if data or frames_added or not pending:
+            self._rx_progress_ts = now
+
+        if frames_added:
+            self._metrics.rx_frames += frames_added
+            self._metrics.rx_bytes += bytes_added
+            self._metrics.last_rx_ts = now
+
+    def _check_rx_stall(self) -> None:
+        """Resync if a partial frame has waited too long with no bytes arriving."""
+        pending = len(self._rx_buffer) - self._rx_head
+        if pending and time.monotonic() - self._rx_progress_ts > _RX_STALL_TIMEOUT:
+            self._resync_rx(pending)
+
+    def _resync_rx(self, pending: int) -> None:
+        """Discard a stuck RX buffer and drop the connection to resync framing."""
+        LOG.warning(
+            "ARDOP RX buffer stuck with %d undelivered byte(s); "
+            "discarding and reconnecting",
+            pending,
+        )
+        self._metrics.rx_errors += 1
+        self._metrics.last_error = "rx_resync"
+        self._rx_buffer.clear()
+        self._rx_head = 0
+        self._rx_backlog = False
+        sock = self._sock
+        if sock is not None:
+            self._drop_socket(sock)
+        else:
+            self._connected.clear()
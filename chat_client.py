@@ -1,8 +1,16 @@
 from __future__ import annotations
 
+import bisect
+import logging
+import operator
+import queue
+import threading
 import time
+from collections import OrderedDict
+from itertools import chain
 from dataclasses import dataclass, field
-from typing import Callable, Dict, List, Tuple, Optional
+from functools import partial
+from typing import Callable, Dict, List, Set, Tuple, Optional
 
 from mesh_config import (
     MeshNodeConfig,
@@ -17,6 +25,9 @@ from chat_protocol import (
     CHAT_TYPE_MESSAGE,
     CHAT_TYPE_SYNC_REQUEST,
     CHAT_TYPE_SYNC_RESPONSE,
+    CHAT_TYPE_SYNC_RESPONSE_BIN,
+    SYNC_RESP_ENC_BIN,
+    SyncRequest,
     encode_chat_message,
     decode_chat_message,
     encode_sync_request,
@@ -25,8 +36,14 @@ from chat_protocol import (
     parse_sync_request_any,
     encode_sync_response,
     parse_sync_response,
+    encode_sync_response_bin,
+    parse_sync_response_bin,
+    encode_sync_record_origin,
+    decode_sync_record_origin,
 )
 
+LOG = logging.getLogger(__name__)
+
 
 @dataclass
 class ChatPeer:
@@ -221,10 +238,59 @@ class MeshChatConfig:
         return eff
 
 
+# node_id -> decoded callsign ("" if none). The node set is small and stable,
+# so reports and UI refreshes keep decoding the same ids; cleared when full.
+_CALLSIGN_CACHE_MAX = 1024
+_callsign_cache: Dict[bytes, str] = {}
+
+
+def _node_callsign(node_id: bytes) -> str:
+    callsign = _callsign_cache.get(node_id)
+    if callsign is None:
+        callsign = node_id.rstrip(b"\x00").decode("ascii", errors="ignore")
+        if len(_callsign_cache) >= _CALLSIGN_CACHE_MAX:
+            _callsign_cache.clear()
+        _callsign_cache[node_id] = callsign
+    return callsign
+
+
+# Size of one generation of MeshChatClient's recently-stored (origin_id, seqno)
+# keys; at most two generations are kept.
+_STORED_KEYS_GENERATION = 4096
+
+# Sync responses waiting for the apply worker. When full, the RX thread
+# applies the next response itself, which slows intake instead of losing it.
+_SYNC_APPLY_QUEUE_SIZE = 64
+
+# Encoded sync responses kept for reuse. When full, expired entries are
+# dropped, then the whole cache if still full.
+_SYNC_RESP_CACHE_SIZE = 64
+
+
 # --------------------------------------------------------------
 # Gap detection (local, in-memory)
 # --------------------------------------------------------------
 
+# Sort keys for _GapTracker's (start, end, detected_ts) missing ranges.
+_RANGE_START = operator.itemgetter(0)
+_RANGE_END = operator.itemgetter(1)
+
+
+@dataclass(slots=True)
+class _OriginState:
+    """Per-origin receive state for _GapTracker."""
+
+    hi_contig: int = -1
+    # Out-of-order seqnos received above hi_contig, and the largest of them
+    ooo: Set[int] = field(default_factory=set)
+    ooo_max: int = -1
+    # Sorted, disjoint (start, end, detected_ts) ranges
+    missing: List[Tuple[int, int, float]] = field(default_factory=list)
+    last_report_ts: float = 0.0
+    # (suspected ranges, confirmed ranges) as of the last report; () if none
+    last_sig: Tuple[Tuple[Tuple[int, int], ...], ...] = ()
+
+
 class _GapTracker:
     """Track missing (origin_id, seqno) under out-of-order delivery.
 
@@ -238,6 +304,8 @@ class _GapTracker:
             self,
             confirm_delay_seconds: float = 90.0,
             min_report_interval_seconds: float = 15.0,
+            max_origins: int = 512,
+            max_ooo_per_origin: int = 4096,
     ) -> None:
         self._confirm_delay = float(confirm_delay_seconds)
         if self._confirm_delay < 0.0:
@@ -247,15 +315,18 @@ class _GapTracker:
         if self._min_report_interval < 0.0:
             self._min_report_interval = 0.0
 
-        # origin_hex -> state
-        self._origins: Dict[str, Dict[str, object]] = {}
+        # Bounds for long uptimes: least-recently-heard origins are evicted,
+        # and an origin buffering too many out-of-order seqnos gives up on
+        # its oldest gap.
+        self._max_origins = max(1, int(max_origins))
+        self._max_ooo = max(1, int(max_ooo_per_origin))
+
+        # origin_id (raw bytes) -> state, least recently heard first
+        self._origins: "OrderedDict[bytes, _OriginState]" = OrderedDict()
 
     @staticmethod
     def _origin_label(origin_id: bytes) -> str:
-        callsign = origin_id.rstrip(b"\x00").decode("ascii", errors="ignore")
-        if callsign:
-            return callsign
-        return origin_id.hex()
+        return _node_callsign(origin_id) or origin_id.hex()
 
     @staticmethod
     def _add_range(
@@ -263,83 +334,78 @@ class _GapTracker:
             start: int,
             end: int,
             detected_ts: float,
-    ) -> List[Tuple[int, int, float]]:
+    ) -> None:
+        """Merge [start, end] into ranges (sorted, disjoint, non-adjacent) in place."""
         if start > end:
-            return ranges
+            return
 
-        new_ranges: List[Tuple[int, int, float]] = []
-        inserted = False
         s = int(start)
         e = int(end)
         ts0 = float(detected_ts)
 
-        for rs, re_, rts in ranges:
-            if re_ + 1 < s:
-                new_ranges.append((rs, re_, rts))
-                continue
-            if e + 1 < rs:
-                if not inserted:
-                    new_ranges.append((s, e, ts0))
-                    inserted = True
-                new_ranges.append((rs, re_, rts))
-                continue
-
+        # Ranges are disjoint and sorted, so their ends are sorted too:
+        # the first range that can touch [s, e] is the first with re_ >= s - 1.
+        lo = bisect.bisect_left(ranges, s - 1, key=_RANGE_END)
+        hi = lo
+        n = len(ranges)
+        while hi < n:
+            rs, re_, rts = ranges[hi]
+            if rs > e + 1:
+                break
             # overlap/adjacent: merge
-            s = min(s, rs)
-            e = max(e, re_)
-            ts0 = min(ts0, float(rts))
-
-        if not inserted:
-            new_ranges.append((s, e, ts0))
+            if rs < s:
+                s = rs
+            if re_ > e:
+                e = re_
+            if rts < ts0:
+                ts0 = rts
+            hi += 1
 
-        new_ranges.sort(key=lambda t: t[0])
-        return new_ranges
+        ranges[lo:hi] = [(s, e, ts0)]
 
     @staticmethod
     def _remove_seq(
             ranges: List[Tuple[int, int, float]],
             seqno: int,
-    ) -> List[Tuple[int, int, float]]:
+    ) -> None:
+        """Remove seqno from ranges in place, splitting its covering range."""
         x = int(seqno)
-        out: List[Tuple[int, int, float]] = []
-        for rs, re_, rts in ranges:
-            if x < rs or x > re_:
-                out.append((rs, re_, rts))
-                continue
-            # split
-            if rs <= x - 1:
-                out.append((rs, x - 1, rts))
-            if x + 1 <= re_:
-                out.append((x + 1, re_, rts))
-        return out
-
-    @staticmethod
-    def _ranges_signature(ranges: List[Tuple[int, int, float]], confirmed: List[bool]) -> str:
-        parts: List[str] = []
-        for (rs, re_, _), is_conf in zip(ranges, confirmed):
-            parts.append(f"{rs}-{re_}:{'C' if is_conf else 'S'}")
-        return "|".join(parts)
-
-    def on_seqno(self, origin_id: bytes, seqno: int, now: float) -> List[str]:
-        """Ingest a received seqno. Returns any new report lines to emit."""
+        idx = bisect.bisect_right(ranges, x, key=_RANGE_START) - 1
+        if idx < 0:
+            return
+        rs, re_, rts = ranges[idx]
+        if x > re_:
+            return
+        # split
+        pieces: List[Tuple[int, int, float]] = []
+        if rs <= x - 1:
+            pieces.append((rs, x - 1, rts))
+        if x + 1 <= re_:
+            pieces.append((x + 1, re_, rts))
+        ranges[idx:idx + 1] = pieces
+
+    def on_seqno(self, origin_id: bytes, seqno: int, now: float, report: bool = True) -> List[str]:
+        """Ingest a received seqno. Returns any new report lines to emit.
+
+        With report=False the state is updated silently; call report() once
+        after a burst so only the final gap state is emitted.
+        """
         if seqno < 0:
             return []
 
-        origin_hex = origin_id.hex()
-        st = self._origins.get(origin_hex)
+        origins = self._origins
+        st = origins.get(origin_id)
         if st is None:
-            st = {
-                "hi_contig": -1,
-                "ooo": {},  # seqno -> None
-                "missing": [],  # List[(start,end,detected_ts)]
-                "last_report_ts": 0.0,
-                "last_sig": "",
-            }
-            self._origins[origin_hex] = st
+            st = _OriginState()
+            origins[origin_id] = st
+            if len(origins) > self._max_origins:
+                origins.popitem(last=False)
+        else:
+            origins.move_to_end(origin_id)
 
-        hi_contig = int(st["hi_contig"])  # type: ignore[assignment]
-        ooo: Dict[int, None] = st["ooo"]  # type: ignore[assignment]
-        missing: List[Tuple[int, int, float]] = st["missing"]  # type: ignore[assignment]
+        hi_contig = st.hi_contig
+        ooo = st.ooo
+        missing = st.missing
 
         # Dedup purely in-memory: if we've already seen it, ignore.
         if seqno <= hi_contig or seqno in ooo:
@@ -347,84 +413,102 @@ class _GapTracker:
 
         if seqno == hi_contig + 1:
             hi_contig = seqno
-            # Advance through any buffered out-of-order messages
-            while (hi_contig + 1) in ooo:
-                del ooo[hi_contig + 1]
-                hi_contig += 1
+            if ooo:
+                if len(ooo) == st.ooo_max - hi_contig:
+                    # Buffered seqnos fill everything up to ooo_max (a
+                    # backlog just completed): fold them in at once.
+                    hi_contig = st.ooo_max
+                    ooo.clear()
+                else:
+                    # Advance through any buffered out-of-order messages
+                    while (hi_contig + 1) in ooo:
+                        ooo.discard(hi_contig + 1)
+                        hi_contig += 1
         else:
-            # Gap discovered: everything between (hi_contig+1 .. seqno-1)
-            gap_start = hi_contig + 1
+            # Gap discovered: everything above the highest seqno seen so far
+            # (hi_contig or a buffered one) up to seqno-1. A seqno below
+            # ooo_max lands inside an already-tracked gap and adds nothing.
+            gap_start = max(hi_contig, st.ooo_max) + 1
             gap_end = seqno - 1
-            missing = self._add_range(missing, gap_start, gap_end, now)
+            self._add_range(missing, gap_start, gap_end, now)
             # Buffer this out-of-order seq
-            ooo[seqno] = None
-            # If this seq was previously considered missing, clear it
-            missing = self._remove_seq(missing, seqno)
-
-        # Also clear this seq from missing (in case it was already in a range)
-        missing = self._remove_seq(missing, seqno)
+            ooo.add(seqno)
+            if seqno > st.ooo_max:
+                st.ooo_max = seqno
+            if len(ooo) > self._max_ooo:
+                # Abandon the oldest gap: resume contiguity at the lowest
+                # buffered seqno (the trim below drops its missing range).
+                hi_contig = min(ooo)
+                ooo.discard(hi_contig)
+                while (hi_contig + 1) in ooo:
+                    ooo.discard(hi_contig + 1)
+                    hi_contig += 1
+
+        # Clear this seq from missing (in case it was already in a range)
+        self._remove_seq(missing, seqno)
 
         # If contig advanced, drop any missing ranges that are now below hi_contig
-        if missing:
-            trimmed: List[Tuple[int, int, float]] = []
-            for rs, re_, rts in missing:
-                if re_ <= hi_contig:
-                    continue
-                if rs <= hi_contig:
-                    rs = hi_contig + 1
-                trimmed.append((rs, re_, rts))
-            missing = trimmed
+        if missing and missing[0][0] <= hi_contig:
+            drop = bisect.bisect_right(missing, hi_contig, key=_RANGE_END)
+            del missing[:drop]
+            if missing and missing[0][0] <= hi_contig:
+                _rs, re_, rts = missing[0]
+                missing[0] = (hi_contig + 1, re_, rts)
+
+        st.hi_contig = hi_contig
 
-        st["hi_contig"] = hi_contig
-        st["ooo"] = ooo
-        st["missing"] = missing
+        if not report:
+            return []
+        return self._maybe_report(origin_id, st, now)
 
+    def report(self, origin_id: bytes, now: float) -> List[str]:
+        """Return report lines for an origin's current gap state, if changed."""
+        st = self._origins.get(origin_id)
+        if st is None:
+            return []
         return self._maybe_report(origin_id, st, now)
 
-    def _maybe_report(self, origin_id: bytes, st: Dict[str, object], now: float) -> List[str]:
-        missing: List[Tuple[int, int, float]] = st["missing"]  # type: ignore[assignment]
+    def _maybe_report(self, origin_id: bytes, st: _OriginState, now: float) -> List[str]:
+        missing = st.missing
         if not missing:
             # If we previously reported gaps, allow a one-time "resolved" message.
-            last_sig = str(st.get("last_sig") or "")
-            if last_sig:
-                last_ts = float(st.get("last_report_ts") or 0.0)
-                if (now - last_ts) >= self._min_report_interval:
-                    st["last_report_ts"] = now
-                    st["last_sig"] = ""
+            if st.last_sig:
+                if (now - st.last_report_ts) >= self._min_report_interval:
+                    st.last_report_ts = now
+                    st.last_sig = ()
                     label = self._origin_label(origin_id)
                     return [f"{label} gaps resolved"]
             return []
 
-        confirmed_flags: List[bool] = []
-        for rs, re_, detected_ts in missing:
-            confirmed_flags.append((now - float(detected_ts)) >= self._confirm_delay)
-
-        sig = self._ranges_signature(missing, confirmed_flags)
-        last_sig = str(st.get("last_sig") or "")
-        last_ts = float(st.get("last_report_ts") or 0.0)
-
-        if sig == last_sig:
+        # Throttled: nothing can be emitted, so skip the per-range work.
+        if (now - st.last_report_ts) < self._min_report_interval:
             return []
 
-        if (now - last_ts) < self._min_report_interval:
+        # One pass: split ranges into status buckets. The buckets themselves
+        # are the change signature (ranges are disjoint and sorted).
+        suspected: List[Tuple[int, int]] = []
+        confirmed: List[Tuple[int, int]] = []
+        confirm_delay = self._confirm_delay
+        for rs, re_, detected_ts in missing:
+            if (now - detected_ts) >= confirm_delay:
+                confirmed.append((rs, re_))
+            else:
+                suspected.append((rs, re_))
+        sig = (tuple(suspected), tuple(confirmed))
+        if sig == st.last_sig:
             return []
 
-        st["last_report_ts"] = now
-        st["last_sig"] = sig
+        st.last_report_ts = now
+        st.last_sig = sig
 
         label = self._origin_label(origin_id)
 
         # Emit one line per status bucket to reduce spam.
         lines: List[str] = []
-        for want_confirmed in (False, True):
-            bucket: List[Tuple[int, int]] = []
-            for (rs, re_, _), is_conf in zip(missing, confirmed_flags):
-                if is_conf == want_confirmed:
-                    bucket.append((rs, re_))
+        for bucket, state in ((suspected, "suspected"), (confirmed, "confirmed")):
             if not bucket:
                 continue
             ranges_str = ", ".join([f"{a}" if a == b else f"{a}\u2013{b}" for a, b in bucket])
-            state = "confirmed" if want_confirmed else "suspected"
             lines.append(f"{label} missing seq {ranges_str} ({state})")
         return lines
 
@@ -462,6 +546,38 @@ class MeshChatClient:
         self._gap_tracker = _GapTracker()
         self._nick = config.mesh_node_config.callsign  # default nick
 
+        # (origin_id, seqno) keys recently written to (or found in) the store.
+        # Lets sync responses skip SQLite for windows we already hold. Kept in
+        # two generations so the memory stays bounded without LRU bookkeeping.
+        self._stored_keys: Set[Tuple[bytes, int]] = set()
+        self._stored_keys_prev: Set[Tuple[bytes, int]] = set()
+
+        # Sync responses are applied on a worker thread so large batches of
+        # DB writes and callbacks don't stall the mesh RX thread. The lock
+        # serializes both receive paths' store/stored-key/gap-tracker updates.
+        self._apply_lock = threading.Lock()
+        self._sync_queue: Optional[queue.Queue] = None
+        self._sync_thread: Optional[threading.Thread] = None
+
+        # (channel, last_n) -> (hex inventory, built_ts) for request_sync_last_n.
+        # Auto-sync asks many peers for the same window in quick succession;
+        # entries live for sync_min_sync_interval_seconds and are dropped when
+        # the channel gains rows.
+        self._inv_cache: Dict[Tuple[str, int], Tuple[Dict[str, int], float]] = {}
+
+        # (channel, request key, encodings, nick) -> (encoded response, built_ts).
+        # Peers on the same channel often send identical sync requests; the
+        # query and encoding are done once and the bytes sent to each of them.
+        # Same lifetime and invalidation as _inv_cache.
+        self._sync_resp_cache: Dict[Tuple[object, ...], Tuple[bytes, float]] = {}
+
+        # Guards both caches above; they are read and filled from the RX,
+        # sync-apply, backend and GUI threads. The epoch is bumped on every
+        # invalidation so an entry built from rows read before a concurrent
+        # write is not cached.
+        self._cache_lock = threading.Lock()
+        self._cache_epoch = 0
+
         self._store = ChatStore(config.db_path)
         # Local-only hook (Feature #7): notify when a new message is stored.
         if hasattr(self._store, "set_on_message_stored") and callable(getattr(self._store, "set_on_message_stored")):
@@ -481,6 +597,16 @@ class MeshChatClient:
 
         self._link_client = None  # set by link_client_factory
 
+        # Inbound app-data dispatch, keyed by chat msg_type. node_mode is fixed
+        # for the client's lifetime, so role gates are applied once here.
+        self._app_dispatch: Dict[int, Callable[[bytes, int, ChatMessage], None]] = {
+            CHAT_TYPE_MESSAGE: self._dispatch_chat_message,
+        }
+        if self._can_participate_in_sync():
+            self._app_dispatch[CHAT_TYPE_SYNC_REQUEST] = self._dispatch_sync_request
+            self._app_dispatch[CHAT_TYPE_SYNC_RESPONSE] = self._dispatch_sync_response
+            self._app_dispatch[CHAT_TYPE_SYNC_RESPONSE_BIN] = self._dispatch_sync_response_bin
+
         def link_client_factory(rx_callback):
             links = []
 
@@ -554,6 +680,11 @@ class MeshChatClient:
             self._mesh_node = None
             self._startup_error = str(exc)
 
+        # Our node ID is fixed for the MeshNode's lifetime; read it once.
+        self._local_node_id: bytes = b""
+        if self._mesh_node is not None:
+            self._local_node_id = getattr(self._mesh_node, "_node_id", b"")
+
     # --------------------------------------------------------------
     # Lifecycle
     # --------------------------------------------------------------
@@ -561,11 +692,27 @@ class MeshChatClient:
     def start(self) -> None:
         if self._mesh_node is None:
             return
+        if self._can_participate_in_sync() and self._sync_thread is None:
+            self._sync_queue = queue.Queue(maxsize=_SYNC_APPLY_QUEUE_SIZE)
+            self._sync_thread = threading.Thread(
+                target=self._sync_apply_loop,
+                name="MeshChatSyncApply",
+                daemon=True,
+            )
+            self._sync_thread.start()
         self._mesh_node.start()
 
     def stop(self) -> None:
         if self._mesh_node is not None:
             self._mesh_node.stop()
+        # RX has stopped, so the queue is finite; wait for the worker to
+        # finish all of it (no timeout) so the store never closes under an
+        # in-flight apply.
+        if self._sync_thread is not None and self._sync_queue is not None:
+            self._sync_queue.put(None)
+            self._sync_thread.join()
+            self._sync_thread = None
+            self._sync_queue = None
         self._store.close()
 
     def set_nick(self, nick: str) -> None:
@@ -573,9 +720,7 @@ class MeshChatClient:
 
     def get_node_id(self) -> bytes:
         """Return our local 8-byte node ID."""
-        if self._mesh_node is None:
-            return b""
-        return getattr(self._mesh_node, "_node_id", b"")
+        return self._local_node_id
 
     def get_link_metrics(self) -> list[dict]:
         """
@@ -641,12 +786,13 @@ class MeshChatClient:
 
         if not self._can_originate_chat():
             raise ValueError(f"Chat origination disabled by node_mode={self._node_mode!r}")
+        now = time.time()
         msg = ChatMessage(
             msg_type=CHAT_TYPE_MESSAGE,
             channel=channel,
             nick=self._nick,
             text=text,
-            created_ts=int(time.time()),
+            created_ts=int(now),
         )
         payload = encode_chat_message(msg)
         data_seqno = self._mesh_node.send_application_data(dest_node_id, payload)
@@ -659,7 +805,7 @@ class MeshChatClient:
                         "channel": channel,
                         "nick": self._nick,
                         "text": text,
-                        "origin_id_hex": self.get_node_id().hex(),
+                        "origin_id_hex": self._local_node_id.hex(),
                         "seqno": int(data_seqno),
                         "created_ts": int(msg.created_ts),
                     },
@@ -668,17 +814,19 @@ class MeshChatClient:
                 pass
         # Log locally as "sent" (if enabled for this role)
         if self._can_store_chat():
-            now = time.time()
             created_ts = int(msg.created_ts)
-            self._store.add_message(
-                origin_id=self.get_node_id(),
-                seqno=int(data_seqno),
-                channel=channel,
-                nick=self._nick,
-                text=text,
-                ts=now,
-                created_ts=created_ts,
-            )
+            with self._apply_lock:
+                self._store.add_message(
+                    origin_id=self._local_node_id,
+                    seqno=int(data_seqno),
+                    channel=channel,
+                    nick=self._nick,
+                    text=text,
+                    ts=now,
+                    created_ts=created_ts,
+                )
+                self._remember_stored(self._local_node_id, int(data_seqno))
+                self._invalidate_inventory(channel)
 
     # --------------------------------------------------------------
     # Sync API
@@ -721,13 +869,21 @@ class MeshChatClient:
             return
 
         # Build inventory from our local last-N window for this channel
-        rows = self._store.get_last_n_messages(channel, int(last_n))
-        inv: Dict[str, int] = {}
-        for origin_id, seqno, _channel, _nick, _text, _ts in rows:
-            key = origin_id.hex()
-            prev = inv.get(key)
-            if prev is None or int(seqno) > prev:
-                inv[key] = int(seqno)
+        now = time.time()
+        cache_key = (channel, int(last_n))
+        with self._cache_lock:
+            cached = self._inv_cache.get(cache_key)
+            epoch = self._cache_epoch
+        if cached is not None and now - cached[1] < float(self._config.sync_min_sync_interval_seconds):
+            inv = cached[0]
+        else:
+            inv = {
+                origin_id.hex(): seqno
+                for origin_id, seqno in self._store.get_seqno_inventory(channel, int(last_n)).items()
+            }
+            with self._cache_lock:
+                if self._cache_epoch == epoch:
+                    self._inv_cache[cache_key] = (inv, now)
 
         payload = encode_sync_request_seqno(
             channel=channel,
@@ -816,7 +972,9 @@ class MeshChatClient:
 
         Returns: number of rows deleted.
         """
-        return self._store.prune_keep_last_n_per_channel(int(keep_last_n))
+        deleted = self._store.prune_keep_last_n_per_channel(int(keep_last_n))
+        self._forget_stored()
+        return deleted
 
     def prune_db_older_than_days(self, days: int, channel: Optional[str] = None) -> int:
         """Manually prune the local chat database by age (local-only).
@@ -826,7 +984,9 @@ class MeshChatClient:
 
         Returns: number of rows deleted.
         """
-        return self._store.prune_older_than_seconds(int(days) * 86400, channel=channel)
+        deleted = self._store.prune_older_than_seconds(int(days) * 86400, channel=channel)
+        self._forget_stored()
+        return deleted
 
     def get_db_stats(self) -> dict:
         """Return basic DB stats for diagnostics."""
@@ -843,27 +1003,24 @@ class MeshChatClient:
         if state is None:
             return {}
 
-        self_id = getattr(self._mesh_node, "_node_id", b"")
+        self_id = self._local_node_id
+        originators = getattr(state, "originators", {})
+        neighbors = getattr(state, "neighbors", {})
         results: Dict[str, Tuple[bytes, float]] = {}
 
-        # Originators
-        for node_id, entry in getattr(state, "originators", {}).items():
-            if node_id == self_id:
-                continue
-            callsign = node_id.rstrip(b"\x00").decode("ascii", errors="ignore")
-            if not callsign:
-                continue
-            last_seen = float(getattr(entry, "last_seen", 0.0))
-            results[callsign] = (node_id, last_seen)
+        # MeshNode's RX/housekeeping threads add and expire entries without a
+        # lock. tuple() copies each table in one C-level step (no Python code
+        # runs, so the GIL is held), so we never iterate a dict mid-resize.
+        snapshot = chain(tuple(originators.items()), tuple(neighbors.items()))
 
-        # Neighbors (merge, preferring newer last_seen)
-        for node_id, entry in getattr(state, "neighbors", {}).items():
+        # Originators and neighbors in one pass, preferring newer last_seen
+        for node_id, entry in snapshot:
             if node_id == self_id:
                 continue
-            callsign = node_id.rstrip(b"\x00").decode("ascii", errors="ignore")
+            callsign = _node_callsign(node_id)
             if not callsign:
                 continue
-            last_seen = float(getattr(entry, "last_seen", 0.0))
+            last_seen = entry.last_seen
             prev = results.get(callsign)
             if prev is None or last_seen > prev[1]:
                 results[callsign] = (node_id, last_seen)
@@ -885,16 +1042,60 @@ class MeshChatClient:
         if msg is None:
             return
 
-        now = time.time()
+        handler = self._app_dispatch.get(msg.msg_type)
+        if handler is not None:
+            handler(origin_id, data_seqno, msg)
+
+    # Uniform (origin_id, data_seqno, msg) adapters for _app_dispatch
+
+    def _dispatch_chat_message(self, origin_id: bytes, data_seqno: int, msg: ChatMessage) -> None:
+        self._handle_incoming_chat_message(origin_id, data_seqno, msg, time.time())
 
-        if msg.msg_type == CHAT_TYPE_MESSAGE:
-            self._handle_incoming_chat_message(origin_id, data_seqno, msg, now)
-        elif msg.msg_type == CHAT_TYPE_SYNC_REQUEST:
-            if self._can_participate_in_sync():
-                self._handle_sync_request(origin_id, msg)
-        elif msg.msg_type == CHAT_TYPE_SYNC_RESPONSE:
-            if self._can_participate_in_sync():
-                self._handle_sync_response(msg)
+    def _dispatch_sync_request(self, origin_id: bytes, _data_seqno: int, msg: ChatMessage) -> None:
+        if self._sync_enabled_for(msg.channel):
+            self._handle_sync_request(origin_id, msg)
+
+    def _dispatch_sync_response(self, _origin_id: bytes, _data_seqno: int, msg: ChatMessage) -> None:
+        if self._sync_enabled_for(msg.channel):
+            self._queue_sync_apply(self._handle_sync_response, msg)
+
+    def _dispatch_sync_response_bin(self, _origin_id: bytes, _data_seqno: int, msg: ChatMessage) -> None:
+        if self._sync_enabled_for(msg.channel):
+            self._queue_sync_apply(self._handle_sync_response_bin, msg)
+
+    def _sync_enabled_for(self, channel: str) -> bool:
+        # chat.sync.enabled / channel_policy.enabled also govern answering and
+        # applying sync, so traffic for disabled channels is dropped here,
+        # before any JSON parse or DB work.
+        return bool(self._config.get_channel_sync_policy(channel).enabled)
+
+    def _queue_sync_apply(self, handler: Callable[[ChatMessage], None], msg: ChatMessage) -> None:
+        q = self._sync_queue
+        if q is None:
+            # No worker (not started): apply inline.
+            handler(msg)
+            return
+        try:
+            q.put_nowait((handler, msg))
+        except queue.Full:
+            # Backpressure: apply on this (RX) thread rather than drop the
+            # response. Store updates are serialized by _apply_lock.
+            handler(msg)
+
+    def _sync_apply_loop(self) -> None:
+        q = self._sync_queue
+        if q is None:
+            return
+        while True:
+            item = q.get()
+            if item is None:
+                return
+            handler, msg = item
+            try:
+                handler(msg)
+            except Exception:
+                # Keep the worker alive; one bad response must not stop sync.
+                LOG.exception("Error applying sync response for %r; dropped", msg.channel)
 
     def _handle_incoming_chat_message(
             self,
@@ -903,6 +1104,8 @@ class MeshChatClient:
             msg: ChatMessage,
             recv_ts: float,
     ) -> None:
+        # ChatMessage always carries created_ts (v1 frames get recv time on decode).
+        created_ts_int = int(msg.created_ts)
         if self._on_event is not None:
             try:
                 self._on_event(
@@ -913,30 +1116,35 @@ class MeshChatClient:
                         "channel": msg.channel,
                         "nick": msg.nick,
                         "text": msg.text,
-                        "created_ts": int(getattr(msg, "created_ts", int(recv_ts))),
+                        "created_ts": created_ts_int,
                     },
                 )
             except Exception:
                 pass
-        if self._can_store_chat():
-            self._store.add_message(
-                origin_id=origin_id,
-                seqno=data_seqno,
-                channel=msg.channel,
-                nick=msg.nick,
-                text=msg.text,
-                ts=recv_ts,
-                created_ts=int(getattr(msg, "created_ts", int(recv_ts))),
-            )
+        gap_lines: List[str] = []
+        with self._apply_lock:
+            if self._can_store_chat():
+                self._store.add_message(
+                    origin_id=origin_id,
+                    seqno=data_seqno,
+                    channel=msg.channel,
+                    nick=msg.nick,
+                    text=msg.text,
+                    ts=recv_ts,
+                    created_ts=created_ts_int,
+                )
+                self._remember_stored(origin_id, int(data_seqno))
+                self._invalidate_inventory(msg.channel)
+
+            # Gap detection (local-only)
+            if self._gap_tracker is not None:
+                gap_lines = self._gap_tracker.on_seqno(origin_id=origin_id, seqno=int(data_seqno), now=float(recv_ts))
 
-        # Gap detection (local-only)
-        if self._gap_tracker is not None:
-            for line in self._gap_tracker.on_seqno(origin_id=origin_id, seqno=int(data_seqno), now=float(recv_ts)):
-                if self._on_gap_report is not None:
-                    self._on_gap_report(line)
+        if self._on_gap_report is not None:
+            for line in gap_lines:
+                self._on_gap_report(line)
 
-        created_ts = float(getattr(msg, "created_ts", int(recv_ts)))
-        self._on_chat_message(msg, origin_id, created_ts)
+        self._on_chat_message(msg, origin_id, float(created_ts_int))
 
     def _handle_sync_request(
             self,
@@ -951,29 +1159,24 @@ class MeshChatClient:
         if max_send <= 0:
             max_send = 1
 
-        records: List[Dict[str, object]] = []
+        # Each branch selects (origin_id, seqno, channel, nick, text, ts) rows,
+        # typed as stored (ints for seqno/ts), so they are used without casts.
+        # The query only runs when no cached response matches query_key.
+        fetch: Callable[[], List[Tuple[bytes, int, str, str, str, int]]]
+        query_key: Tuple[object, ...]
 
         if req.mode == "since_ts":
             since_ts = req.since_ts
             if since_ts is None:
                 return
 
-            records_raw = self._store.get_messages_since(
+            query_key = ("since_ts", since_ts)
+            fetch = partial(
+                self._store.get_messages_since,
                 channel=msg.channel,
                 since_ts=since_ts,
                 limit=max_send,
             )
-            for origin_bytes, seqno, _channel, nick, text, ts in records_raw:
-                records.append(
-                    {
-                        "origin_id_hex": origin_bytes.hex(),
-                        "seqno": int(seqno),
-                        "nick": nick,
-                        "text": text,
-                        "ts": int(ts),
-                    }
-                )
-
         elif req.mode == "range":
             origin_hex = req.origin_id_hex
             if origin_hex is None:
@@ -987,24 +1190,15 @@ class MeshChatClient:
             if start_seq > end_seq:
                 start_seq, end_seq = end_seq, start_seq
 
-            records_raw = self._store.get_messages_for_origin_seq_range(
+            query_key = ("range", want_origin, start_seq, end_seq)
+            fetch = partial(
+                self._store.get_messages_for_origin_seq_range,
                 channel=msg.channel,
                 origin_id=want_origin,
                 start_seqno=start_seq,
                 end_seqno=end_seq,
                 limit=max_send,
             )
-            for origin_bytes, seqno, _channel, nick, text, ts in records_raw:
-                records.append(
-                    {
-                        "origin_id_hex": origin_bytes.hex(),
-                        "seqno": int(seqno),
-                        "nick": nick,
-                        "text": text,
-                        "ts": int(ts),
-                    }
-                )
-
         elif req.mode == "seqno":
             # Clamp request last_n to something reasonable (and to our configured default)
             last_n = int(req.last_n)
@@ -1014,36 +1208,130 @@ class MeshChatClient:
             if last_n > int(self._config.sync_last_n_messages):
                 last_n = int(self._config.sync_last_n_messages)
 
-            window_rows = self._store.get_last_n_messages(msg.channel, last_n)
-
-            inv = req.inv
-            sent = 0
-            for origin_bytes, seqno, _channel, nick, text, ts in window_rows:
-                if sent >= max_send:
-                    break
-                origin_hex = origin_bytes.hex()
-                have_max = inv.get(origin_hex)
-                if have_max is not None and int(seqno) <= int(have_max):
+            inventory: Dict[bytes, int] = {}
+            for origin_hex, have_max in req.inv.items():
+                try:
+                    inventory[bytes.fromhex(origin_hex)] = int(have_max)
+                except ValueError:
                     continue
-                records.append(
-                    {
-                        "origin_id_hex": origin_hex,
-                        "seqno": int(seqno),
-                        "nick": nick,
-                        "text": text,
-                        "ts": int(ts),
-                    }
-                )
-                sent += 1
+
+            # The store drops rows the peer already holds and applies max_send.
+            query_key = ("seqno", last_n, frozenset(inventory.items()))
+            fetch = partial(
+                self._store.get_missing_from_inventory,
+                msg.channel,
+                last_n,
+                inventory,
+                limit=max_send,
+            )
         else:
             return
 
-        response_payload = encode_sync_response(
-            channel=msg.channel,
+        now = time.time()
+        cache_key = (msg.channel, query_key, req.resp_enc, req.origin_enc, self._nick)
+        with self._cache_lock:
+            cached = self._sync_resp_cache.get(cache_key)
+            epoch = self._cache_epoch
+        if cached is not None and now - cached[1] < float(self._config.sync_min_sync_interval_seconds):
+            self._mesh_node.send_application_data(origin_id, cached[0])
+            return
+
+        rows = fetch()
+        response_payload = self._encode_sync_response_for(msg.channel, req, rows)
+        self._remember_sync_response(cache_key, response_payload, now, epoch)
+        self._mesh_node.send_application_data(origin_id, response_payload)
+
+    def _encode_sync_response_for(
+            self,
+            channel: str,
+            req: SyncRequest,
+            rows: List[Tuple[bytes, int, str, str, str, int]],
+    ) -> bytes:
+        if req.resp_enc == SYNC_RESP_ENC_BIN:
+            try:
+                return encode_sync_response_bin(
+                    channel=channel,
+                    nick=self._nick,
+                    records=[
+                        (origin_bytes, seqno, nick, text, ts)
+                        for origin_bytes, seqno, _channel, nick, text, ts in rows
+                    ],
+                )
+            except ValueError:
+                pass  # doesn't fit the binary format; answer with JSON
+
+        # Built in one pass at its final size; records stay dicts because
+        # they are serialized as JSON objects.
+        origin_enc = req.origin_enc
+        records: List[Dict[str, object]] = [
+            {
+                origin_key: origin_val,
+                "seqno": seqno,
+                "nick": nick,
+                "text": text,
+                "ts": ts,
+            }
+            for origin_bytes, seqno, _channel, nick, text, ts in rows
+            for origin_key, origin_val in (encode_sync_record_origin(origin_bytes, origin_enc),)
+        ]
+
+        return encode_sync_response(
+            channel=channel,
             nick=self._nick,
             records=records,
         )
-        self._mesh_node.send_application_data(origin_id, response_payload)
+
+    def _remember_sync_response(
+            self,
+            cache_key: Tuple[object, ...],
+            payload: bytes,
+            now: float,
+            epoch: int,
+    ) -> None:
+        ttl = float(self._config.sync_min_sync_interval_seconds)
+        with self._cache_lock:
+            if self._cache_epoch != epoch:
+                # Rows changed while this response was built.
+                return
+            cache = self._sync_resp_cache
+            if len(cache) >= _SYNC_RESP_CACHE_SIZE:
+                for key, (_payload, built_ts) in tuple(cache.items()):
+                    if now - built_ts >= ttl:
+                        del cache[key]
+                if len(cache) >= _SYNC_RESP_CACHE_SIZE:
+                    cache.clear()
+            cache[cache_key] = (payload, now)
+
+    def _remember_stored(self, origin_id: bytes, seqno: int) -> None:
+        keys = self._stored_keys
+        keys.add((origin_id, seqno))
+        if len(keys) >= _STORED_KEYS_GENERATION:
+            self._stored_keys_prev = keys
+            self._stored_keys = set()
+
+    def _is_known_stored(self, origin_id: bytes, seqno: int) -> bool:
+        key = (origin_id, seqno)
+        return key in self._stored_keys or key in self._stored_keys_prev
+
+    def _forget_stored(self) -> None:
+        # Pruned rows may be re-synced, so the cache must not vouch for them.
+        # Taken under the apply lock so a batch being applied cannot re-add
+        # keys for rows the prune just deleted after this clears them.
+        with self._apply_lock:
+            self._stored_keys = set()
+            self._stored_keys_prev = set()
+        with self._cache_lock:
+            self._cache_epoch += 1
+            self._inv_cache.clear()
+            self._sync_resp_cache.clear()
+
+    def _invalidate_inventory(self, channel: str) -> None:
+        with self._cache_lock:
+            self._cache_epoch += 1
+            for key in [k for k in self._inv_cache if k[0] == channel]:
+                del self._inv_cache[key]
+            for key in [k for k in self._sync_resp_cache if k[0] == channel]:
+                del self._sync_resp_cache[key]
 
     def _handle_sync_response(
             self,
@@ -1055,16 +1343,16 @@ class MeshChatClient:
         if records is None:
             return
 
-        applied = 0
-
+        # Validate everything first, then insert the batch in one transaction.
+        valid: List[Tuple[bytes, int, str, str, int]] = []
         for record in records:
-            origin_hex = record.get("origin_id_hex")
+            origin_bytes = decode_sync_record_origin(record)
             seqno_val = record.get("seqno")
             nick_val = record.get("nick")
             text_val = record.get("text")
             ts_val = record.get("ts")
 
-            if not isinstance(origin_hex, str):
+            if origin_bytes is None:
                 continue
             if not isinstance(seqno_val, int):
                 continue
@@ -1075,40 +1363,71 @@ class MeshChatClient:
             if not isinstance(ts_val, (float, int)):
                 continue
 
-            origin_bytes = bytes.fromhex(origin_hex)
-            seqno_int = int(seqno_val)
-            created_ts_int = int(ts_val)
-            recv_ts = time.time()
-
-            if self._store.has_message(origin_bytes, seqno_int):
-                continue
+            valid.append((origin_bytes, int(seqno_val), nick_val, text_val, int(ts_val)))
 
-            self._store.add_message(
-                origin_id=origin_bytes,
-                seqno=seqno_int,
-                channel=msg.channel,
-                nick=nick_val,
-                text=text_val,
-                ts=recv_ts,
-                created_ts=created_ts_int,
-            )
-            applied += 1
+        self._apply_sync_records(msg.channel, valid)
 
-            # Gap detection (local-only)
-            if self._gap_tracker is not None:
-                for line in self._gap_tracker.on_seqno(origin_id=origin_bytes, seqno=seqno_int, now=float(recv_ts)):
-                    if self._on_gap_report is not None:
-                        self._on_gap_report(line)
+    def _handle_sync_response_bin(
+            self,
+            msg: ChatMessage,
+    ) -> None:
+        if not self._can_store_chat():
+            return
+        records = parse_sync_response_bin(msg)
+        if records is None:
+            return
+        # The binary decoder already yields typed (origin, seqno, nick, text, ts).
+        self._apply_sync_records(msg.channel, records)
 
+    def _apply_sync_records(
+            self,
+            channel: str,
+            records: List[Tuple[bytes, int, str, str, int]],
+    ) -> None:
+        # One response is one arrival: every record shares its receive time.
+        recv_ts = time.time()
+        gap_tracker = self._gap_tracker
+        gap_lines: List[str] = []
+        with self._apply_lock:
+            rows: List[Tuple[bytes, int, str, str, str, float, int]] = []
+            for origin_bytes, seqno_int, nick_val, text_val, created_ts_int in records:
+                if self._is_known_stored(origin_bytes, seqno_int):
+                    # Already held: skip the SQLite round-trip entirely.
+                    continue
+                rows.append((origin_bytes, seqno_int, channel, nick_val, text_val, recv_ts, created_ts_int))
+
+            # INSERT OR IGNORE dedups against existing rows (replaces has_message)
+            inserted = self._store.add_messages(rows)
+            # Inserted or ignored, every row is in the store now.
+            for row in rows:
+                self._remember_stored(row[0], row[1])
+            if inserted:
+                self._invalidate_inventory(channel)
+
+            if gap_tracker is not None:
+                # Gap reports are emitted once per origin after the whole
+                # batch instead of once per intermediate state.
+                gap_origins: Dict[bytes, None] = {}
+                for row in inserted:
+                    gap_tracker.on_seqno(origin_id=row[0], seqno=row[1], now=float(recv_ts), report=False)
+                    gap_origins[row[0]] = None
+                for origin_bytes in gap_origins:
+                    gap_lines.extend(gap_tracker.report(origin_bytes, float(recv_ts)))
+
+        applied = len(inserted)
+        for origin_bytes, _seqno, _channel, nick_val, text_val, _ts, created_ts_int in inserted:
             chat_msg = ChatMessage(
-
                 msg_type=CHAT_TYPE_MESSAGE,
-                channel=msg.channel,
+                channel=channel,
                 nick=nick_val,
                 text=text_val,
                 created_ts=created_ts_int,
             )
             self._on_chat_message(chat_msg, origin_bytes, float(created_ts_int))
 
+        if self._on_gap_report is not None:
+            for line in gap_lines:
+                self._on_gap_report(line)
+
         if applied > 0 and self._on_sync_applied is not None:
-            self._on_sync_applied(msg.channel, applied)
+            self._on_sync_applied(channel, applied)
@@ -123,13 +123,16 @@ def main(argv: Optional[list[str]] = None) -> int:
         nonlocal stop
         stop = True
 
-    signal.signal(signal.SIGINT, _handle_signal)
-    signal.signal(signal.SIGTERM, _handle_signal)
-
     ui_q = backend.get_ui_queue()
 
-    # Main loop: drain backend UI queue and log to stdout.
+    # Main loop: drain backend UI queue and log to stdout. The wait stays
+    # bounded: on Windows a signal does not interrupt a blocking lock wait.
     try:
+        # Installed inside the try so a signal from here on still reaches
+        # backend.shutdown() in the finally.
+        signal.signal(signal.SIGINT, _handle_signal)
+        signal.signal(signal.SIGTERM, _handle_signal)
+
         while not stop:
             try:
                 ev = ui_q.get(timeout=0.5)
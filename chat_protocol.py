@@ -1,11 +1,38 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Sequence, Tuple
+import base64
+import binascii
 import json
 import struct
 import time
 
+try:
+    import orjson
+    _HAS_ORJSON = True
+except ImportError:
+    orjson = None   # type: ignore
+    _HAS_ORJSON = False
+
+# Sync payloads are JSON. orjson, when installed, is used for speed; both
+# produce the same JSON values, and orjson.JSONDecodeError subclasses
+# json.JSONDecodeError, so callers handle one exception type.
+if _HAS_ORJSON:
+    def _json_dumps(obj: Any) -> bytes:
+        return orjson.dumps(obj)
+
+    def _json_loads(text: str) -> Any:
+        return orjson.loads(text)
+else:
+    def _json_dumps(obj: Any) -> bytes:
+        # json.dumps escapes non-ASCII, so the body is plain ASCII.
+        return json.dumps(obj).encode("ascii")
+
+    def _json_loads(text: str) -> Any:
+        return json.loads(text)
+
+
 # Protocol version:
 # - v1: [ver][type][chan_len][nick_len][chan][nick][text]
 # - v2: [ver][type][chan_len][nick_len][created_ts_u32][chan][nick][text]
@@ -14,9 +41,33 @@ CHAT_VERSION = 2
 CHAT_TYPE_MESSAGE = 1
 CHAT_TYPE_SYNC_REQUEST = 5
 CHAT_TYPE_SYNC_RESPONSE = 6
+# Same content as SYNC_RESPONSE in a compact binary body (see
+# encode_sync_response_bin). Only sent to requesters that asked for it.
+CHAT_TYPE_SYNC_RESPONSE_BIN = 7
 
+# Message types whose body is binary: decode_chat_message leaves it in
+# ChatMessage.body instead of decoding it as UTF-8 text.
+_BINARY_BODY_TYPES = frozenset((CHAT_TYPE_SYNC_RESPONSE_BIN,))
 
-@dataclass
+# How SYNC_RESPONSE records carry origin_id. Requesters advertise "b64" via
+# the optional "origin_enc" request key; peers that don't know the key ignore
+# it and keep answering with "origin_id_hex", so both sides stay compatible.
+SYNC_ORIGIN_ENC_HEX = "hex"
+SYNC_ORIGIN_ENC_B64 = "b64"
+
+# Response body a requester accepts, via the optional "resp_enc" request key.
+# Peers that don't know the key keep answering with JSON SYNC_RESPONSE.
+SYNC_RESP_ENC_JSON = "json"
+SYNC_RESP_ENC_BIN = "bin"
+
+_SYNC_BIN_VERSION = 1
+_U32 = struct.Struct(">I")
+# v2 header: ver, type, chan_len, nick_len, created_ts
+_V2_HEADER = struct.Struct(">BBBBI")
+
+
+# slots: one instance per decoded frame and per send; no per-instance dict.
+@dataclass(slots=True)
 class ChatMessage:
     msg_type: int
     channel: str
@@ -24,6 +75,8 @@ class ChatMessage:
     text: str
     # Unix UTC seconds when the message was created (sender-side).
     created_ts: int
+    # Raw body for binary message types (text is "" for those).
+    body: bytes = b""
 
 
 def encode_chat_message(msg: ChatMessage) -> bytes:
@@ -33,9 +86,17 @@ def encode_chat_message(msg: ChatMessage) -> bytes:
     v1: [ver][type][chan_len][nick_len][chan][nick][text]
     v2: [ver][type][chan_len][nick_len][created_ts_u32][chan][nick][text]
     """
-    channel_bytes = msg.channel.encode("utf-8")
-    nick_bytes = msg.nick.encode("utf-8")
-    text_bytes = msg.text.encode("utf-8")
+    if msg.msg_type in _BINARY_BODY_TYPES:
+        body = bytes(msg.body)
+    else:
+        body = msg.text.encode("utf-8")
+    return _encode_chat_frame(msg.msg_type, msg.channel, msg.nick, body, msg.created_ts)
+
+
+def _encode_chat_frame(msg_type: int, channel: str, nick: str, body: bytes, created_ts: int) -> bytes:
+    """Encode a v2 frame around an already-encoded body."""
+    channel_bytes = channel.encode("utf-8")
+    nick_bytes = nick.encode("utf-8")
 
     chan_len = len(channel_bytes)
     nick_len = len(nick_bytes)
@@ -45,70 +106,80 @@ def encode_chat_message(msg: ChatMessage) -> bytes:
     if nick_len > 255:
         raise ValueError("nick too long")
 
-    header = bytearray(4)
-    header[0] = CHAT_VERSION
-    header[1] = msg.msg_type
-    header[2] = chan_len
-    header[3] = nick_len
-
-    created_ts = int(msg.created_ts)
+    created_ts = int(created_ts)
     if created_ts < 0 or created_ts > 0xFFFFFFFF:
         raise ValueError("created_ts out of range for uint32")
-    ts_bytes = struct.pack(">I", created_ts)
 
-    return bytes(header) + ts_bytes + channel_bytes + nick_bytes + text_bytes
+    # Header and ts are packed in one call; join() sizes the frame once and
+    # copies each part a single time.
+    header = _V2_HEADER.pack(CHAT_VERSION, msg_type, chan_len, nick_len, created_ts)
+    return b"".join((header, channel_bytes, nick_bytes, body))
+
+
+# Encoded channel/nick -> decoded str. Few distinct names appear on a mesh,
+# so decoded frames share one str object per name (identity-fast dict
+# lookups downstream). Bounded instead of sys.intern because names are
+# peer-controlled; cleared when full.
+_NAME_CACHE_MAX = 1024
+_name_cache: Dict[bytes, str] = {}
+
+
+def _decode_name(raw: bytes) -> str:
+    name = _name_cache.get(raw)
+    if name is None:
+        name = raw.decode("utf-8", errors="replace")
+        if len(_name_cache) >= _NAME_CACHE_MAX:
+            _name_cache.clear()
+        _name_cache[raw] = name
+    return name
 
 
 def decode_chat_message(data: bytes) -> Optional[ChatMessage]:
-    if len(data) < 4:
+    if not data:
         return None
 
+    # Dispatch on version before touching anything else, so foreign or
+    # malformed frames are dropped without slicing.
     version = data[0]
-    msg_type = data[1]
-    chan_len = data[2]
-    nick_len = data[3]
-
-    # Backward compatibility: v1 had no created_ts.
-    if version == 1:
+    if version == CHAT_VERSION:
+        header_len = _V2_HEADER.size
+        if len(data) < header_len:
+            return None
+        _, msg_type, chan_len, nick_len, created_ts = _V2_HEADER.unpack_from(data)
+    elif version == 1:
+        # Backward compatibility: v1 had no created_ts; use receive time.
         header_len = 4
-        needed = header_len + chan_len + nick_len
-        if len(data) < needed:
+        if len(data) < header_len:
             return None
-
-        channel_bytes = data[header_len: header_len + chan_len]
-        nick_bytes = data[header_len + chan_len: header_len + chan_len + nick_len]
-        text_bytes = data[header_len + chan_len + nick_len:]
-
-        return ChatMessage(
-            msg_type=msg_type,
-            channel=channel_bytes.decode("utf-8", errors="replace"),
-            nick=nick_bytes.decode("utf-8", errors="replace"),
-            text=text_bytes.decode("utf-8", errors="replace"),
-            created_ts=int(time.time()),
-        )
-
-    if version != CHAT_VERSION:
+        msg_type, chan_len, nick_len = data[1], data[2], data[3]
+        created_ts = int(time.time())
+    else:
         return None
 
-    header_len = 4
-    if len(data) < header_len + 4:
+    # Text is the rest of the frame, so this is the only length check needed.
+    chan_end = header_len + chan_len
+    nick_end = chan_end + nick_len
+    if len(data) < nick_end:
         return None
-    created_ts = struct.unpack(">I", data[header_len: header_len + 4])[0]
-    header_len += 4
 
-    needed = header_len + chan_len + nick_len
-    if len(data) < needed:
-        return None
+    channel = _decode_name(bytes(data[header_len:chan_end]))
+    nick = _decode_name(bytes(data[chan_end:nick_end]))
 
-    channel_bytes = data[header_len: header_len + chan_len]
-    nick_bytes = data[header_len + chan_len: header_len + chan_len + nick_len]
-    text_bytes = data[header_len + chan_len + nick_len:]
+    if msg_type in _BINARY_BODY_TYPES:
+        return ChatMessage(
+            msg_type=msg_type,
+            channel=channel,
+            nick=nick,
+            text="",
+            created_ts=int(created_ts),
+            body=bytes(data[nick_end:]),
+        )
 
     return ChatMessage(
         msg_type=msg_type,
-        channel=channel_bytes.decode("utf-8", errors="replace"),
-        nick=nick_bytes.decode("utf-8", errors="replace"),
-        text=text_bytes.decode("utf-8", errors="replace"),
+        channel=channel,
+        nick=nick,
+        text=data[nick_end:].decode("utf-8", errors="replace"),
         created_ts=int(created_ts),
     )
 
@@ -127,6 +198,12 @@ class SyncRequest:
     origin_id_hex: Optional[str]
     start: int
     end: int
+    # Optional in every mode: {"origin_enc":"b64"} asks for base64 origin ids
+    # in the response records; absent/unknown means hex.
+    origin_enc: str = SYNC_ORIGIN_ENC_HEX
+    # Optional in every mode: {"resp_enc":"bin"} accepts SYNC_RESPONSE_BIN;
+    # absent/unknown means JSON.
+    resp_enc: str = SYNC_RESP_ENC_JSON
 
 
 def encode_sync_request(channel: str, nick: str, since_ts: float) -> bytes:
@@ -135,15 +212,13 @@ def encode_sync_request(channel: str, nick: str, since_ts: float) -> bytes:
 
     Note: since_ts is interpreted as "created_ts" (unix seconds).
     """
-    payload = {"since_ts": since_ts}
-    msg = ChatMessage(
-        msg_type=CHAT_TYPE_SYNC_REQUEST,
-        channel=channel,
-        nick=nick,
-        text=json.dumps(payload),
-        created_ts=int(time.time()),
-    )
-    return encode_chat_message(msg)
+    payload = {
+        "since_ts": since_ts,
+        "origin_enc": SYNC_ORIGIN_ENC_B64,
+        "resp_enc": SYNC_RESP_ENC_BIN,
+    }
+    body = _json_dumps(payload)
+    return _encode_chat_frame(CHAT_TYPE_SYNC_REQUEST, channel, nick, body, int(time.time()))
 
 
 def encode_sync_request_seqno(
@@ -160,15 +235,11 @@ def encode_sync_request_seqno(
         "mode": "seqno",
         "last_n": int(last_n),
         "inv": inv,
+        "origin_enc": SYNC_ORIGIN_ENC_B64,
+        "resp_enc": SYNC_RESP_ENC_BIN,
     }
-    msg = ChatMessage(
-        msg_type=CHAT_TYPE_SYNC_REQUEST,
-        channel=channel,
-        nick=nick,
-        text=json.dumps(payload),
-        created_ts=int(time.time()),
-    )
-    return encode_chat_message(msg)
+    body = _json_dumps(payload)
+    return _encode_chat_frame(CHAT_TYPE_SYNC_REQUEST, channel, nick, body, int(time.time()))
 
 
 def parse_sync_request_any(msg: ChatMessage) -> Optional[SyncRequest]:
@@ -176,13 +247,15 @@ def parse_sync_request_any(msg: ChatMessage) -> Optional[SyncRequest]:
     Parse either v1 {"since_ts": ...} or v2 {"mode":"seqno",...}.
     """
     try:
-        obj = json.loads(msg.text)
+        obj = _json_loads(msg.text)
     except json.JSONDecodeError:
         return None
     if not isinstance(obj, dict):
         return None
 
     mode = obj.get("mode")
+    origin_enc = SYNC_ORIGIN_ENC_B64 if obj.get("origin_enc") == SYNC_ORIGIN_ENC_B64 else SYNC_ORIGIN_ENC_HEX
+    resp_enc = SYNC_RESP_ENC_BIN if obj.get("resp_enc") == SYNC_RESP_ENC_BIN else SYNC_RESP_ENC_JSON
 
     if mode == "range":
         origin_hex = obj.get("origin_id_hex")
@@ -200,6 +273,8 @@ def parse_sync_request_any(msg: ChatMessage) -> Optional[SyncRequest]:
             origin_id_hex=origin_hex,
             start=int(start),
             end=int(end),
+            origin_enc=origin_enc,
+            resp_enc=resp_enc,
         )
 
     if mode == "seqno":
@@ -215,13 +290,33 @@ def parse_sync_request_any(msg: ChatMessage) -> Optional[SyncRequest]:
             if isinstance(k, str) and isinstance(v, int):
                 inv_clean[k] = v
 
-        return SyncRequest(mode="seqno", since_ts=None, last_n=int(last_n), inv=inv_clean, origin_id_hex=None, start=0, end=0)
+        return SyncRequest(
+            mode="seqno",
+            since_ts=None,
+            last_n=int(last_n),
+            inv=inv_clean,
+            origin_id_hex=None,
+            start=0,
+            end=0,
+            origin_enc=origin_enc,
+            resp_enc=resp_enc,
+        )
 
     # v1
     since_ts = obj.get("since_ts")
     if not isinstance(since_ts, (float, int)):
         return None
-    return SyncRequest(mode="since_ts", since_ts=float(since_ts), last_n=0, inv={}, origin_id_hex=None, start=0, end=0)
+    return SyncRequest(
+        mode="since_ts",
+        since_ts=float(since_ts),
+        last_n=0,
+        inv={},
+        origin_id_hex=None,
+        start=0,
+        end=0,
+        origin_enc=origin_enc,
+        resp_enc=resp_enc,
+    )
 
 
 # Backward-compatible name for older code:
@@ -258,15 +353,11 @@ def encode_sync_request_range(
         "origin_id_hex": origin_id.hex(),
         "start": int(start),
         "end": int(end),
+        "origin_enc": SYNC_ORIGIN_ENC_B64,
+        "resp_enc": SYNC_RESP_ENC_BIN,
     }
-    msg = ChatMessage(
-        msg_type=CHAT_TYPE_SYNC_REQUEST,
-        channel=channel,
-        nick=nick,
-        text=json.dumps(payload),
-        created_ts=int(time.time()),
-    )
-    return encode_chat_message(msg)
+    body = _json_dumps(payload)
+    return _encode_chat_frame(CHAT_TYPE_SYNC_REQUEST, channel, nick, body, int(time.time()))
 
 
 def encode_sync_response(
@@ -278,23 +369,191 @@ def encode_sync_response(
     SYNC_RESPONSE: text = JSON list of records:
       {"origin_id_hex": str, "seqno": int, "nick": str, "text": str, "ts": int}
 
+    If the request advertised origin_enc="b64", records carry
+    "origin_id_b64" instead of "origin_id_hex" (see encode_sync_record_origin).
+
     Note: "ts" is the created timestamp (unix seconds).
     """
-    msg = ChatMessage(
-        msg_type=CHAT_TYPE_SYNC_RESPONSE,
-        channel=channel,
-        nick=nick,
-        text=json.dumps(records),
-        created_ts=int(time.time()),
-    )
-    return encode_chat_message(msg)
+    body = _json_dumps(records)
+    return _encode_chat_frame(CHAT_TYPE_SYNC_RESPONSE, channel, nick, body, int(time.time()))
 
 
 def parse_sync_response(msg: ChatMessage) -> Optional[List[Dict[str, Any]]]:
     try:
-        obj = json.loads(msg.text)
+        obj = _json_loads(msg.text)
     except json.JSONDecodeError:
         return None
     if not isinstance(obj, list):
         return None
     return obj
+
+
+def _pack_varint(out: bytearray, value: int) -> None:
+    while value > 0x7F:
+        out.append((value & 0x7F) | 0x80)
+        value >>= 7
+    out.append(value)
+
+
+def _unpack_varint(data: bytes, pos: int) -> Tuple[int, int]:
+    """Return (value, new_pos); raises IndexError/ValueError on bad input."""
+    value = 0
+    shift = 0
+    while True:
+        byte = data[pos]
+        pos += 1
+        value |= (byte & 0x7F) << shift
+        if not byte & 0x80:
+            return value, pos
+        shift += 7
+        if shift > 63:
+            raise ValueError("varint too long")
+
+
+def encode_sync_response_bin(
+    channel: str,
+    nick: str,
+    records: Sequence[Tuple[bytes, int, str, str, int]],
+) -> bytes:
+    """
+    SYNC_RESPONSE_BIN: the same records as encode_sync_response, given as
+    (origin_id, seqno, nick, text, ts) tuples, in a binary body:
+
+      [ver u8][origin_count u8] then origin_count x [len u8][origin_id]
+      [record_count varint] then per record:
+        [origin_index u8][seqno varint][ts u32][nick_len u8][nick]
+        [text_len varint][text]
+
+    Origin ids are sent raw, once per response, and records refer to them by
+    index. Raises ValueError if the records don't fit the format (more than
+    255 origins, oversized ids/nicks, non-int seqno/ts, ts outside uint32);
+    callers then fall back to encode_sync_response.
+    """
+    origin_index: Dict[bytes, int] = {}
+    body = bytearray()
+    for origin_id, seqno, rec_nick, text, ts in records:
+        idx = origin_index.get(origin_id)
+        if idx is None:
+            # origin_count is a u8, so at most 255 origins (indexes 0..254).
+            idx = len(origin_index)
+            if idx >= 255 or len(origin_id) > 255:
+                raise ValueError("sync response origins do not fit binary format")
+            origin_index[origin_id] = idx
+        nick_bytes = rec_nick.encode("utf-8")
+        text_bytes = text.encode("utf-8")
+        if len(nick_bytes) > 255:
+            raise ValueError("nick too long")
+        if not isinstance(seqno, int) or not isinstance(ts, int):
+            raise ValueError("seqno/ts must be integers")
+        if seqno < 0 or not 0 <= ts <= 0xFFFFFFFF:
+            raise ValueError("seqno/ts out of range")
+        body.append(idx)
+        _pack_varint(body, seqno)
+        body += _U32.pack(ts)
+        body.append(len(nick_bytes))
+        body += nick_bytes
+        _pack_varint(body, len(text_bytes))
+        body += text_bytes
+
+    out = bytearray((_SYNC_BIN_VERSION, len(origin_index)))
+    for origin_id in origin_index:
+        out.append(len(origin_id))
+        out += origin_id
+    _pack_varint(out, len(records))
+    out += body
+
+    return _encode_chat_frame(CHAT_TYPE_SYNC_RESPONSE_BIN, channel, nick, bytes(out), int(time.time()))
+
+
+def parse_sync_response_bin(msg: ChatMessage) -> Optional[List[Tuple[bytes, int, str, str, int]]]:
+    """
+    Decode a SYNC_RESPONSE_BIN body into (origin_id, seqno, nick, text, ts)
+    tuples. Returns None if the body is malformed or an unknown version.
+    """
+    data = msg.body
+    try:
+        if data[0] != _SYNC_BIN_VERSION:
+            return None
+        origin_count = data[1]
+        pos = 2
+        origins: List[bytes] = []
+        for _ in range(origin_count):
+            origin_len = data[pos]
+            pos += 1
+            origin_id = data[pos: pos + origin_len]
+            if len(origin_id) != origin_len:
+                return None
+            origins.append(origin_id)
+            pos += origin_len
+
+        record_count, pos = _unpack_varint(data, pos)
+        records: List[Tuple[bytes, int, str, str, int]] = []
+        for _ in range(record_count):
+            origin_id = origins[data[pos]]
+            seqno, pos = _unpack_varint(data, pos + 1)
+            ts = _U32.unpack_from(data, pos)[0]
+            nick_len = data[pos + 4]
+            pos += 5
+            nick_bytes = data[pos: pos + nick_len]
+            pos += nick_len
+            text_len, pos = _unpack_varint(data, pos)
+            text_bytes = data[pos: pos + text_len]
+            pos += text_len
+            if len(nick_bytes) != nick_len or len(text_bytes) != text_len:
+                return None
+            records.append(
+                (
+                    origin_id,
+                    seqno,
+                    nick_bytes.decode("utf-8", errors="replace"),
+                    text_bytes.decode("utf-8", errors="replace"),
+                    ts,
+                )
+            )
+    except (IndexError, ValueError, struct.error):
+        return None
+    return records
+
+
+# (origin_id, origin_enc) -> record (key, value). A response repeats the same
+# few origins across many records; cleared when full.
+_ORIGIN_FIELD_CACHE_MAX = 1024
+_origin_field_cache: Dict[Tuple[bytes, str], Tuple[str, str]] = {}
+
+
+def encode_sync_record_origin(origin_id: bytes, origin_enc: str) -> Tuple[str, str]:
+    """
+    Return the (key, value) pair that carries origin_id in a SYNC_RESPONSE record,
+    using the encoding the requester asked for.
+    """
+    cache_key = (origin_id, origin_enc)
+    field = _origin_field_cache.get(cache_key)
+    if field is None:
+        if origin_enc == SYNC_ORIGIN_ENC_B64:
+            field = ("origin_id_b64", base64.b64encode(origin_id).decode("ascii"))
+        else:
+            field = ("origin_id_hex", origin_id.hex())
+        if len(_origin_field_cache) >= _ORIGIN_FIELD_CACHE_MAX:
+            _origin_field_cache.clear()
+        _origin_field_cache[cache_key] = field
+    return field
+
+
+def decode_sync_record_origin(record: Dict[str, Any]) -> Optional[bytes]:
+    """
+    Extract origin_id bytes from a SYNC_RESPONSE record (base64 or hex form).
+    Returns None if the field is missing or malformed.
+    """
+    b64_val = record.get("origin_id_b64")
+    if isinstance(b64_val, str):
+        try:
+            return base64.b64decode(b64_val, validate=True)
+        except (binascii.Error, ValueError):
+            return None
+    hex_val = record.get("origin_id_hex")
+    if isinstance(hex_val, str):
+        try:
+            return bytes.fromhex(hex_val)
+        except ValueError:
+            return None
+    return None
@@ -3,8 +3,20 @@
 from __future__ import annotations
 
 import sqlite3
+import threading
 import time
-from typing import List, Tuple, Optional, Callable, Dict, Any
+from typing import List, Tuple, Optional, Callable, Dict, Any, Iterator
+
+
+# Largest peer inventory get_missing_from_inventory joins in SQL: two bind
+# parameters per entry must stay under SQLite's historical 999-variable limit.
+_MAX_INVENTORY_JOIN = 400
+
+# Bytes of the DB file SQLite may memory-map for reads (0 disables).
+_MMAP_SIZE = 64 * 1024 * 1024
+
+# SQLite page cache per connection, in KiB (the default is ~2 MiB).
+_CACHE_SIZE_KIB = 8000
 
 
 class ChatStore:
@@ -13,6 +25,9 @@ class ChatStore:
 
     - One DB file per node (configurable via path).
     - Deduplicates messages by (origin_id, seqno).
+    - WAL journal with synchronous=NORMAL: commits are not fsynced until a
+      checkpoint, so a power loss may drop the last few messages (never
+      corrupts the DB); they are recovered by the next sync.
     """
 
     def __init__(self, db_path: str) -> None:
@@ -21,8 +36,43 @@ class ChatStore:
         # Optional local-only hook: called after a message is successfully stored.
         self._on_message_stored: Optional[Callable[[Dict[str, Any]], None]] = None
         self._conn.execute("PRAGMA journal_mode=WAL")
+        # In WAL mode NORMAL only fsyncs at checkpoints; a power loss can drop
+        # the newest commits but never corrupts the DB, and lost chat rows come
+        # back through sync.
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute("PRAGMA busy_timeout=5000")
+        # Sorts/GROUP BY temp B-trees stay in RAM; reads go through a shared
+        # mapping instead of copying pages into the page cache.
+        self._conn.execute("PRAGMA temp_store=MEMORY")
+        self._conn.execute(f"PRAGMA mmap_size={_MMAP_SIZE}")
+        self._conn.execute(f"PRAGMA cache_size=-{_CACHE_SIZE_KIB}")
         self._init_schema()
 
+        # Writes go through self._conn; reads use one connection per thread
+        # (see _reader) so WAL lets UI/sync queries run alongside RX inserts.
+        self._tls = threading.local()
+        self._readers: List[sqlite3.Connection] = []
+        self._readers_lock = threading.Lock()
+
+    def _reader(self) -> sqlite3.Connection:
+        """Return this thread's read-only connection, opening it on first use."""
+        conn = getattr(self._tls, "conn", None)
+        if conn is not None:
+            return conn
+        if self._db_path == ":memory:":
+            # A second connection would open a different, empty database.
+            return self._conn
+        # check_same_thread=False only so close() can close it from any thread.
+        conn = sqlite3.connect(self._db_path, check_same_thread=False)
+        conn.execute("PRAGMA busy_timeout=5000")
+        conn.execute("PRAGMA temp_store=MEMORY")
+        conn.execute(f"PRAGMA mmap_size={_MMAP_SIZE}")
+        conn.execute("PRAGMA query_only=1")
+        with self._readers_lock:
+            self._readers.append(conn)
+        self._tls.conn = conn
+        return conn
+
     def set_on_message_stored(self, cb: Optional[Callable[[Dict[str, Any]], None]]) -> None:
         """Set a callback invoked after add_message stores a new row.
 
@@ -56,6 +106,20 @@ class ChatStore:
             self._conn.execute("ALTER TABLE chat_messages ADD COLUMN created_ts INTEGER;")
             self._conn.execute("UPDATE chat_messages SET created_ts = CAST(ts AS INTEGER) WHERE created_ts IS NULL;")
 
+        # Last-N windows, since_ts queries and pruning all filter by channel
+        # and order by created_ts (id is the rowid, so it rides along).
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_chat_messages_channel_created "
+            "ON chat_messages(channel, created_ts);"
+        )
+        # get_recent_messages takes a channel's newest rows by id: entries of
+        # a (channel) index are rowid-ordered per channel, so that is a short
+        # reverse walk instead of sorting the whole channel.
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_chat_messages_channel "
+            "ON chat_messages(channel);"
+        )
+
         self._conn.commit()
 
     def add_message(
@@ -97,22 +161,75 @@ class ChatStore:
         self._conn.commit()
 
         # Fire hook only when a new row was inserted (not a deduped IGNORE).
-        if cur.rowcount == 1 and self._on_message_stored is not None:
-            try:
-                self._on_message_stored(
-                    {
-                        "origin_id": origin_id,
-                        "seqno": int(seqno),
-                        "channel": channel,
-                        "nick": nick,
-                        "text": text,
-                        "ts": float(ts),
-                        "created_ts": int(created_ts),
-                    }
+        if cur.rowcount == 1:
+            self._notify_stored(origin_id, int(seqno), channel, nick, text, float(ts), int(created_ts))
+
+    def add_messages(
+            self,
+            rows: List[Tuple[bytes, int, str, str, str, float, int]],
+    ) -> List[Tuple[bytes, int, str, str, str, float, int]]:
+        """
+        Insert many messages in a single transaction, ignoring ones already present.
+
+        Args:
+            rows: (origin_id, seqno, channel, nick, text, ts, created_ts) tuples,
+                  with ts/created_ts as for add_message
+
+        Returns:
+            The rows that were newly inserted, in input order.
+        """
+        if not rows:
+            return []
+
+        insert_sql = """
+        INSERT OR IGNORE INTO chat_messages
+            (origin_id, seqno, channel, nick, text, ts, created_ts)
+        VALUES (?, ?, ?, ?, ?, ?, ?);
+        """
+        inserted: List[Tuple[bytes, int, str, str, str, float, int]] = []
+        # One commit for the whole batch; rowcount still tells us per row
+        # whether it was new or a deduped IGNORE.
+        with self._conn:
+            for row in rows:
+                origin_id, seqno, channel, nick, text, ts, created_ts = row
+                cur = self._conn.execute(
+                    insert_sql,
+                    (origin_id, int(seqno), channel, nick, text, float(ts), int(created_ts)),
                 )
-            except Exception:
-                # Store must remain robust even if a hook misbehaves.
-                pass
+                if cur.rowcount == 1:
+                    inserted.append(row)
+
+        for origin_id, seqno, channel, nick, text, ts, created_ts in inserted:
+            self._notify_stored(origin_id, int(seqno), channel, nick, text, float(ts), int(created_ts))
+        return inserted
+
+    def _notify_stored(
+            self,
+            origin_id: bytes,
+            seqno: int,
+            channel: str,
+            nick: str,
+            text: str,
+            ts: float,
+            created_ts: int,
+    ) -> None:
+        if self._on_message_stored is None:
+            return
+        try:
+            self._on_message_stored(
+                {
+                    "origin_id": origin_id,
+                    "seqno": seqno,
+                    "channel": channel,
+                    "nick": nick,
+                    "text": text,
+                    "ts": ts,
+                    "created_ts": created_ts,
+                }
+            )
+        except Exception:
+            # Store must remain robust even if a hook misbehaves.
+            pass
 
     def has_message(self, origin_id: bytes, seqno: int) -> bool:
         sql = """
@@ -120,7 +237,7 @@ class ChatStore:
         WHERE origin_id = ? AND seqno = ?
         LIMIT 1;
         """
-        cur = self._conn.execute(sql, (origin_id, int(seqno)))
+        cur = self._reader().execute(sql, (origin_id, int(seqno)))
         row = cur.fetchone()
         return row is not None
 
@@ -138,37 +255,58 @@ class ChatStore:
         """
         if limit <= 0:
             sql_all = """
-            SELECT origin_id, seqno, channel, nick, text, created_ts
+            SELECT origin_id, seqno, channel, nick, text, CAST(created_ts AS REAL)
             FROM chat_messages
             WHERE channel = ?
             ORDER BY created_ts ASC, id ASC;
             """
-            cur = self._conn.execute(sql_all, (channel,))
-            rows = cur.fetchall()
-            return [(r[0], int(r[1]), r[2], r[3], r[4], float(r[5])) for r in rows]
+            cur = self._reader().execute(sql_all, (channel,))
+            return cur.fetchall()
+
+        # Take the newest rows by id, then reorder them for display in SQL so
+        # rows come back ready to use without a Python sort/convert pass.
+        sql = """
+        SELECT origin_id, seqno, channel, nick, text, CAST(created_ts AS REAL)
+        FROM (
+            SELECT id, origin_id, seqno, channel, nick, text, created_ts
+            FROM chat_messages
+            WHERE channel = ?
+            ORDER BY id DESC
+            LIMIT ?
+        )
+        ORDER BY created_ts ASC, id ASC;
+        """
+        cur = self._reader().execute(sql, (channel, int(limit)))
+        return cur.fetchall()
 
+    def iter_messages(
+            self,
+            channel: str,
+    ) -> Iterator[Tuple[bytes, int, str, str, str, float]]:
+        """
+        Yield every message for a channel, in the same order and row shape as
+        get_recent_messages(channel, limit=0), straight from the cursor.
+
+        Used by bulk export so full channel history is never held in memory.
+        """
         sql = """
-        SELECT id, origin_id, seqno, channel, nick, text, created_ts
+        SELECT origin_id, seqno, channel, nick, text, CAST(created_ts AS REAL)
         FROM chat_messages
         WHERE channel = ?
-        ORDER BY id DESC
-        LIMIT ?;
+        ORDER BY created_ts ASC, id ASC;
         """
-        cur = self._conn.execute(sql, (channel, int(limit)))
-        rows = cur.fetchall()
-
-        # rows: (id, origin_id, seqno, channel, nick, text, created_ts)
-        rows.sort(key=lambda r: (r[6], r[0]))
-        return [(r[1], int(r[2]), r[3], r[4], r[5], float(r[6])) for r in rows]
+        yield from self._reader().execute(sql, (channel,))
 
     def get_messages_since(
             self,
             channel: str,
             since_ts: float,
             limit: int = 100,
-    ) -> List[Tuple[bytes, int, str, str, str, float]]:
+    ) -> List[Tuple[bytes, int, str, str, str, int]]:
         """
         Return messages in a channel with created_ts > since_ts, ordered by created_ts.
+
+        Sync rows are returned as stored: created_ts is an int.
         """
         sql = """
         SELECT origin_id, seqno, channel, nick, text, created_ts
@@ -177,9 +315,8 @@ class ChatStore:
         ORDER BY created_ts ASC
         LIMIT ?;
         """
-        cur = self._conn.execute(sql, (channel, float(since_ts), int(limit)))
-        rows = cur.fetchall()
-        return [(r[0], int(r[1]), r[2], r[3], r[4], float(r[5])) for r in rows]
+        cur = self._reader().execute(sql, (channel, float(since_ts), int(limit)))
+        return cur.fetchall()
 
     def get_last_n_messages(
             self,
@@ -195,16 +332,114 @@ class ChatStore:
             return []
 
         sql = """
-        SELECT id, origin_id, seqno, channel, nick, text, created_ts
-        FROM chat_messages
-        WHERE channel = ?
-        ORDER BY created_ts DESC, id DESC
-        LIMIT ?;
+        SELECT origin_id, seqno, channel, nick, text, CAST(created_ts AS REAL)
+        FROM (
+            SELECT id, origin_id, seqno, channel, nick, text, created_ts
+            FROM chat_messages
+            WHERE channel = ?
+            ORDER BY created_ts DESC, id DESC
+            LIMIT ?
+        )
+        ORDER BY created_ts ASC, id ASC;
         """
-        cur = self._conn.execute(sql, (channel, int(last_n)))
-        rows = cur.fetchall()
-        rows.sort(key=lambda r: (r[6], r[0]))
-        return [(r[1], int(r[2]), r[3], r[4], r[5], float(r[6])) for r in rows]
+        cur = self._reader().execute(sql, (channel, int(last_n)))
+        return cur.fetchall()
+
+    def get_seqno_inventory(
+            self,
+            channel: str,
+            last_n: int,
+    ) -> Dict[bytes, int]:
+        """
+        Return {origin_id: max seqno} over the last N messages of a channel.
+
+        Same window as get_last_n_messages, aggregated in SQL so message
+        bodies are never fetched. Used to build seqno sync inventories.
+        """
+        if last_n <= 0:
+            return {}
+
+        sql = """
+        SELECT origin_id, MAX(seqno)
+        FROM (
+            SELECT origin_id, seqno
+            FROM chat_messages
+            WHERE channel = ?
+            ORDER BY created_ts DESC, id DESC
+            LIMIT ?
+        )
+        GROUP BY origin_id;
+        """
+        cur = self._reader().execute(sql, (channel, int(last_n)))
+        return {r[0]: int(r[1]) for r in cur.fetchall()}
+
+    def get_missing_from_inventory(
+            self,
+            channel: str,
+            last_n: int,
+            inventory: Dict[bytes, int],
+            limit: int = 200,
+    ) -> List[Tuple[bytes, int, str, str, str, int]]:
+        """
+        Return messages from the last-N window of a channel that a peer's
+        inventory ({origin_id: max seqno held}) does not cover, ordered by
+        created_ts ascending and capped at `limit`.
+
+        The inventory is joined in SQL so only rows the peer needs are fetched.
+        Sync rows are returned as stored: created_ts is an int.
+        """
+        if last_n <= 0 or limit <= 0:
+            return []
+
+        window_sql = """
+            SELECT id, origin_id, seqno, channel, nick, text, created_ts
+            FROM chat_messages
+            WHERE channel = ?
+            ORDER BY created_ts DESC, id DESC
+            LIMIT ?
+        """
+
+        if len(inventory) > _MAX_INVENTORY_JOIN:
+            # Too many bind parameters for one statement; filter the window here.
+            cur = self._reader().execute(
+                f"SELECT * FROM ({window_sql}) ORDER BY created_ts ASC, id ASC;",
+                (channel, int(last_n)),
+            )
+            out: List[Tuple[bytes, int, str, str, str, int]] = []
+            for row in cur:
+                have_max = inventory.get(row[1])
+                if have_max is not None and row[2] <= have_max:
+                    continue
+                out.append(row[1:])
+                if len(out) >= limit:
+                    break
+            return out
+
+        params: List[Any] = []
+        if inventory:
+            values = ", ".join(["(?, ?)"] * len(inventory))
+            for origin_id, max_seqno in inventory.items():
+                params.append(origin_id)
+                params.append(int(max_seqno))
+            sql = f"""
+            WITH inv(oid, mx) AS (VALUES {values})
+            SELECT w.origin_id, w.seqno, w.channel, w.nick, w.text, w.created_ts
+            FROM ({window_sql}) AS w
+            LEFT JOIN inv ON w.origin_id = inv.oid
+            WHERE inv.mx IS NULL OR w.seqno > inv.mx
+            ORDER BY w.created_ts ASC, w.id ASC
+            LIMIT ?;
+            """
+        else:
+            sql = f"""
+            SELECT w.origin_id, w.seqno, w.channel, w.nick, w.text, w.created_ts
+            FROM ({window_sql}) AS w
+            ORDER BY w.created_ts ASC, w.id ASC
+            LIMIT ?;
+            """
+        params.extend((channel, int(last_n), int(limit)))
+        cur = self._reader().execute(sql, params)
+        return cur.fetchall()
 
     def get_messages_for_origin_seq_range(
             self,
@@ -213,12 +448,13 @@ class ChatStore:
             start_seqno: int,
             end_seqno: int,
             limit: int = 200,
-    ) -> List[Tuple[bytes, int, str, str, str, float]]:
+    ) -> List[Tuple[bytes, int, str, str, str, int]]:
         """
         Return messages for a specific origin_id within a seqno range (inclusive),
         scoped to a channel, ordered by seqno ascending.
 
-        Used for targeted sync ("range" mode).
+        Used for targeted sync ("range" mode). Rows are returned as stored:
+        created_ts is an int.
         """
         if start_seqno > end_seqno:
             start_seqno, end_seqno = end_seqno, start_seqno
@@ -231,25 +467,36 @@ class ChatStore:
         ORDER BY seqno ASC
         LIMIT ?;
         """
-        cur = self._conn.execute(
+        cur = self._reader().execute(
             sql, (channel, origin_id, int(start_seqno), int(end_seqno), int(limit))
         )
-        rows = cur.fetchall()
-        return [(r[0], int(r[1]), r[2], r[3], r[4], float(r[5])) for r in rows]
+        return cur.fetchall()
 
     def list_channels(self, limit: int = 50) -> List[str]:
         """
         Return distinct channel identifiers ordered by most recent activity
         by created time.
         """
+        # Walk the distinct channels with one index seek each (a recursive
+        # "skip scan" over idx_chat_messages_channel), then take each
+        # channel's MAX(created_ts) from idx_chat_messages_channel_created.
+        # Cost scales with the number of channels, not the number of rows.
         sql = """
-        SELECT channel, MAX(created_ts) AS last_ts
-        FROM chat_messages
-        GROUP BY channel
+        WITH RECURSIVE ch(channel) AS (
+            SELECT MIN(channel) FROM chat_messages
+            UNION ALL
+            SELECT (SELECT MIN(channel) FROM chat_messages WHERE channel > ch.channel)
+            FROM ch
+            WHERE ch.channel IS NOT NULL
+        )
+        SELECT channel,
+               (SELECT MAX(created_ts) FROM chat_messages m WHERE m.channel = ch.channel) AS last_ts
+        FROM ch
+        WHERE channel IS NOT NULL
         ORDER BY last_ts DESC
         LIMIT ?;
         """
-        cur = self._conn.execute(sql, (int(limit),))
+        cur = self._reader().execute(sql, (int(limit),))
         rows = cur.fetchall()
         return [str(r[0]) for r in rows]
 
@@ -264,22 +511,24 @@ class ChatStore:
         if keep_last_n < 1:
             raise ValueError("keep_last_n must be >= 1")
 
-        channels = self.list_channels(limit=10_000)
-        deleted_total = 0
-
-        for chan in channels:
-            delete_sql = """
-            DELETE FROM chat_messages
-            WHERE channel = ?
-              AND id NOT IN (
-                SELECT id FROM chat_messages
-                WHERE channel = ?
-                ORDER BY created_ts DESC, id DESC
-                LIMIT ?
-              );
-            """
-            cur = self._conn.execute(delete_sql, (chan, chan, int(keep_last_n)))
-            deleted_total += int(cur.rowcount if cur.rowcount is not None else 0)
+        # One pass ranks every row within its channel (window functions need
+        # SQLite 3.25+); rows past keep_last_n are deleted in one statement.
+        # (Subquery rather than a leading WITH: sqlite3 reports rowcount only
+        # for statements that start with DELETE.)
+        delete_sql = """
+        DELETE FROM chat_messages
+        WHERE id IN (
+            SELECT id FROM (
+                SELECT id, ROW_NUMBER() OVER (
+                    PARTITION BY channel ORDER BY created_ts DESC, id DESC
+                ) AS rn
+                FROM chat_messages
+            )
+            WHERE rn > ?
+        );
+        """
+        cur = self._conn.execute(delete_sql, (int(keep_last_n),))
+        deleted_total = int(cur.rowcount if cur.rowcount is not None else 0)
 
         self._conn.commit()
         return deleted_total
@@ -317,7 +566,7 @@ class ChatStore:
     def get_db_stats(self) -> dict:
         """Return basic DB stats for diagnostics (local-only)."""
         try:
-            cur = self._conn.execute(
+            cur = self._reader().execute(
                 "SELECT COUNT(*), COUNT(DISTINCT channel), MIN(created_ts), MAX(created_ts) FROM chat_messages"
             )
             row = cur.fetchone()
@@ -336,4 +585,8 @@ class ChatStore:
         }
 
     def close(self) -> None:
+        with self._readers_lock:
+            readers, self._readers = self._readers, []
+        for conn in readers:
+            conn.close()
         self._conn.close()
@@ -13,13 +13,15 @@ This module is designed to be:
 from __future__ import annotations
 
 import argparse
-import csv
 import os
 import re
 import time
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 from datetime import datetime, timezone
-from typing import Iterable, Optional
+from functools import lru_cache
+from itertools import chain
+from typing import Dict, Iterable, List, Optional
 
 import yaml
 
@@ -41,6 +43,18 @@ def _timestamped_folder_name(now: Optional[float] = None) -> str:
     return dt.strftime("%Y%m%d-%H%M%S")
 
 
+# Export files are written sequentially in one go; a large buffer turns the
+# many small per-row writes into a few large write() calls.
+_EXPORT_BUFFER_SIZE = 1 << 20
+
+# Channels are exported concurrently by up to this many threads (further
+# capped by the CPU count). Each thread reads through its own SQLite
+# connection (see ChatStore._reader).
+_EXPORT_MAX_WORKERS = 8
+
+# CSV rows are joined and written this many at a time.
+_CSV_BATCH_ROWS = 256
+
 _filename_safe_re = re.compile(r"[^A-Za-z0-9._-]+")
 
 
@@ -106,23 +120,21 @@ def export_all_chat_logs(
     store = ChatStore(db_path)
     try:
         channels = store.list_channels(limit=100000)
-        files_written = 0
 
+        # Channels whose names sanitize to the same filename are exported by
+        # one task, in order, so the last one wins as it would serially.
+        by_filename: Dict[str, List[str]] = {}
         for ch in channels:
-            # Export all messages for that channel
-            rows = store.get_recent_messages(ch, limit=0)
-            if not rows:
-                continue
-
-            filename = _sanitize_channel_to_filename(ch, fmt_norm)
-            out_path = os.path.join(out_dir, filename)
+            by_filename.setdefault(_sanitize_channel_to_filename(ch, fmt_norm), []).append(ch)
 
-            if fmt_norm == "csv":
-                _write_channel_csv(out_path, ch, rows)
-            else:
-                _write_channel_txt(out_path, ch, rows)
-
-            files_written += 1
+        workers = max(1, min(_EXPORT_MAX_WORKERS, os.cpu_count() or 1, len(by_filename)))
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="ChatLogExport") as pool:
+            files_written = sum(
+                pool.map(
+                    lambda item: _export_channels(store, item[1], os.path.join(out_dir, item[0]), fmt_norm),
+                    by_filename.items(),
+                )
+            )
 
     finally:
         store.close()
@@ -130,29 +142,87 @@ def export_all_chat_logs(
     return ExportResult(export_dir=out_dir, files_written=files_written, channels_exported=len(channels))
 
 
+@lru_cache(maxsize=1024)
+def _utc_date_iso(days: int) -> str:
+    # Civil date for a count of days since 1970-01-01 (H. Hinnant's
+    # civil_from_days). Consecutive rows are usually on the same day.
+    z = days + 719468
+    era = z // 146097
+    doe = z - era * 146097
+    yoe = (doe - doe // 1460 + doe // 36524 - doe // 146096) // 365
+    doy = doe - (365 * yoe + yoe // 4 - yoe // 100)
+    mp = (5 * doy + 2) // 153
+    day = doy - (153 * mp + 2) // 5 + 1
+    month = mp + 3 if mp < 10 else mp - 9
+    year = yoe + era * 400 + (month <= 2)
+    return f"{year:04d}-{month:02d}-{day:02d}"
+
+
+def _export_channels(store: ChatStore, channels: List[str], out_path: str, fmt: str) -> int:
+    files_written = 0
+    for ch in channels:
+        # Export all messages for that channel, streamed from the cursor
+        rows = store.iter_messages(ch)
+        first = next(rows, None)
+        if first is None:
+            continue
+        rows = chain((first,), rows)
+
+        if fmt == "csv":
+            _write_channel_csv(out_path, ch, rows)
+        else:
+            _write_channel_txt(out_path, ch, rows)
+
+        files_written += 1
+    return files_written
+
+
+def _ts_to_hhmmss(ts: float) -> str:
+    rem = int(ts // 1) % 86400
+    return f"{rem // 3600:02d}:{rem // 60 % 60:02d}:{rem % 60:02d}"
+
+
 def _ts_to_iso(ts: float) -> str:
-    # created_ts is stored in seconds (int) but provided as float for UI formatting
-    dt = datetime.fromtimestamp(float(ts), tz=timezone.utc)
-    return dt.isoformat(timespec="seconds")
+    # created_ts is stored in seconds (int) but provided as float for UI formatting.
+    # Formatted arithmetically; equivalent to
+    # datetime.fromtimestamp(ts, tz=timezone.utc).isoformat(timespec="seconds").
+    days, rem = divmod(int(ts // 1), 86400)
+    return f"{_utc_date_iso(days)}T{rem // 3600:02d}:{rem // 60 % 60:02d}:{rem % 60:02d}+00:00"
+
+
+def _csv_field(value: str) -> str:
+    # Same quoting as csv.writer's default (excel, QUOTE_MINIMAL) dialect.
+    if "," in value or '"' in value or "\n" in value or "\r" in value:
+        return '"' + value.replace('"', '""') + '"'
+    return value
 
 
 def _write_channel_csv(out_path: str, channel: str, rows: Iterable[tuple[bytes, int, str, str, str, float]]) -> None:
-    with open(out_path, "w", newline="", encoding="utf-8") as f:
-        w = csv.writer(f)
+    # The schema is fixed, so rows are formatted directly rather than through
+    # csv.writer; output matches the excel dialect (CRLF line endings).
+    channel_field = _csv_field(channel)
+    with open(out_path, "w", newline="", encoding="utf-8", buffering=_EXPORT_BUFFER_SIZE) as f:
         # Required fields: timestamps, nick, channel, message text
-        w.writerow(["created_ts_iso_utc", "created_ts_unix", "nick", "channel", "text"])
+        f.write("created_ts_iso_utc,created_ts_unix,nick,channel,text\r\n")
+        batch: list[str] = []
         for (_origin_id, _seqno, _ch, nick, text, created_ts) in rows:
-            w.writerow([_ts_to_iso(created_ts), int(created_ts), nick, channel, text])
+            batch.append(
+                f"{_ts_to_iso(created_ts)},{int(created_ts)},{_csv_field(nick)},{channel_field},{_csv_field(text)}\r\n"
+            )
+            if len(batch) >= _CSV_BATCH_ROWS:
+                f.write("".join(batch))
+                batch.clear()
+        if batch:
+            f.write("".join(batch))
 
 
 def _write_channel_txt(out_path: str, channel: str, rows: Iterable[tuple[bytes, int, str, str, str, float]]) -> None:
-    with open(out_path, "w", encoding="utf-8") as f:
+    with open(out_path, "w", encoding="utf-8", buffering=_EXPORT_BUFFER_SIZE) as f:
         f.write(f"# Export: {channel}\n")
         f.write("# Format: [HH:MM:SS] <nick> message\n")
         f.write("# Times are UTC created timestamps.\n\n")
         for (_origin_id, _seqno, _ch, nick, text, created_ts) in rows:
-            hhmmss = datetime.fromtimestamp(float(created_ts), tz=timezone.utc).strftime("%H:%M:%S")
-            f.write(f"[{hhmmss}] <{nick}> {text}\n")
+            f.write(f"[{_ts_to_hhmmss(created_ts)}] <{nick}> {text}\n")
 
 
 def main(argv: Optional[list[str]] = None) -> int:
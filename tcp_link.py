@@ -28,7 +28,7 @@ import queue
 import socket
 import threading
 import time
-from dataclasses import dataclass, asdict
+from dataclasses import dataclass, fields
 from typing import Callable, Optional
 
 LOG = logging.getLogger(__name__)
@@ -74,7 +74,11 @@ class LinkMetrics:
     last_error: str = ""
 
     def to_dict(self) -> dict:
-        return asdict(self)
+        # Flat scalar fields only: skip asdict()'s recursive deep copy.
+        return {name: getattr(self, name) for name in _METRIC_FIELDS}
+
+
+_METRIC_FIELDS = tuple(f.name for f in fields(LinkMetrics))
 
 
 @dataclass(frozen=True)
@@ -262,12 +266,14 @@ class TcpLinkClient:
     def send(self, payload: bytes) -> None:
         if not self._running.is_set():
             return
-        if not isinstance(payload, (bytes, bytearray)):
+        if not isinstance(payload, (bytes, bytearray, memoryview)):
             raise TypeError("payload must be bytes-like")
-        if payload == b"":
+        if not payload:
             return
+        if type(payload) is not bytes:
+            payload = bytes(payload)
         try:
-            self._tx_queue.put_nowait(bytes(payload))
+            self._tx_queue.put_nowait(payload)
         except queue.Full:
             # Drop rather than block the mesh node
             self._metrics.tx_dropped_q_full += 1
@@ -280,7 +286,7 @@ class TcpLinkClient:
         with self._lock:
             self._metrics.connected = self._connected.is_set()
             self._metrics.running = self._running.is_set()
-            return dict(self._metrics.to_dict())
+            return self._metrics.to_dict()
 
     # ------------------------------------------------------------------
     # Connection management + handshake
@@ -513,7 +519,7 @@ class TcpLinkClient:
             except queue.Empty:
                 continue
 
-            if payload == b"":
+            if not payload:
                 continue
 
             if not self._connected.is_set():